@@ -4,6 +4,7 @@ Copyright (c) 2019 - present AppSeed.us
 """
 
 import os
+import time
 
 from flask import Flask
 from flask_login import LoginManager
@@ -47,7 +48,69 @@ def configure_database(app):
     def shutdown_session(exception=None):
         db.session.remove()
 
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter_ns())
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    from calculation import timing
+
+    elapsed = time.perf_counter_ns() - conn.info['query_start'].pop()
+    recorder = timing.current_recorder()
+    if recorder is not None:
+        recorder.add('db', elapsed)
+
+def configure_timing(app):
+    """
+    Record per-request stage timings and send them as a Server-Timing
+    header; add ?debug_timing=1 to also get them in JSON responses.
+    Only active with SERVER_TIMING=1 (see calculation/timing.py).
+    """
+    from flask import request
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from calculation import timing
+
+    if not timing.enabled:
+        return
+
+    class TimedJSONProvider(DefaultJSONProvider):
+        @timing.timed('serialize')
+        def response(self, *args, **kwargs):
+            return super().response(*args, **kwargs)
+
+    app.json = TimedJSONProvider(app)
+
+    # The listeners are global to every Engine, so add them only once per process
+    if not event.contains(Engine, 'before_cursor_execute', _query_started):
+        event.listen(Engine, 'before_cursor_execute', _query_started)
+        event.listen(Engine, 'after_cursor_execute', _query_finished)
+
+    @app.before_request
+    def start_timing():
+        timing.start_recording()
+
+    @app.after_request
+    def add_server_timing(response):
+        recorder = timing.current_recorder()
+        if recorder is None:
+            return response
+        if request.args.get('debug_timing') and response.is_json:
+            body = response.get_json()
+            if isinstance(body, dict):
+                body["_timing"] = recorder.summary()
+                response.set_data(app.json.dumps(body))
+                response.headers['Cache-Control'] = 'no-store'
+        response.headers['Server-Timing'] = recorder.server_timing()
+        return response
+
+    @app.teardown_request
+    def stop_timing(exception=None):
+        timing.stop_recording()
+
 from apps.authentication.oauth import github_blueprint
+from apps.metrics import configure_metrics
 
 def create_app(config):
     app = Flask(__name__)
@@ -56,4 +119,6 @@ def create_app(config):
     register_blueprints(app)
     app.register_blueprint(github_blueprint, url_prefix="/login")
     configure_database(app)
+    configure_timing(app)
+    configure_metrics(app)
     return app
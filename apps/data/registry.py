@@ -0,0 +1,92 @@
+"""
+In-memory registry of the read-only reference tables.
+
+The stem, branch, division and cycle tables are tiny and never change at
+runtime, so they are read once per process into immutable records keyed by
+pinyin.  Call ``reload_reference_data()`` after re-seeding the data database,
+and bump ``ALGORITHM_VERSION`` (calculation/version.py) so cached BaZi
+responses are dropped.
+"""
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from apps.data.session import data_session
+from apps.data.tables import Stems, StemOrgan, BranchOrgan, HiddenStem, Divisions, CycleCalendar
+from calculation.timing import timed
+
+StemRecord = namedtuple("StemRecord", ["pinyin", "chinese_char", "organ", "phase", "gm", "polarity"])
+BranchRecord = namedtuple("BranchRecord", ["pinyin", "chinese_char", "organ", "phase", "hidden_stems"])
+DivisionRecord = namedtuple("DivisionRecord", ["name", "element", "phase"])
+ReferenceData = namedtuple("ReferenceData", ["stems", "branches", "divisions", "cycle"])
+
+_reference_data = None
+_reference_lock = threading.Lock()
+
+
+def _load_reference_data(session) -> ReferenceData:
+    stem_rows   = {rec.name: rec for rec in session.query(Stems)}
+    stem_organs = {rec.pinyin: rec for rec in session.query(StemOrgan)}
+    stems = {}
+    for pinyin in list(stem_organs) + [n for n in stem_rows if n not in stem_organs]:
+        organ = stem_organs.get(pinyin)
+        stem  = stem_rows.get(pinyin)
+        stems[pinyin] = StemRecord(
+            pinyin=pinyin,
+            chinese_char=organ.chinese_char if organ else None,
+            organ=organ.organ if organ else None,
+            phase=organ.phase if organ else None,
+            gm=stem.gm if stem else None,
+            polarity=stem.polarity if stem else None,
+        )
+
+    hidden = {rec.branch: tuple(rec.hidden_stems or ()) for rec in session.query(HiddenStem)}
+    branches = {}
+    for rec in session.query(BranchOrgan):
+        branches[rec.pinyin] = BranchRecord(
+            pinyin=rec.pinyin,
+            chinese_char=rec.chinese_char,
+            organ=rec.organ,
+            phase=rec.phase,
+            hidden_stems=hidden.get(rec.pinyin, ()),
+        )
+    for pinyin, hidden_stems in hidden.items():
+        if pinyin not in branches:
+            branches[pinyin] = BranchRecord(pinyin, None, None, None, hidden_stems)
+
+    divisions = {
+        rec.name: DivisionRecord(rec.name, rec.element, rec.phase)
+        for rec in session.query(Divisions)
+    }
+    cycle = tuple(
+        (rec.stem, rec.branch)
+        for rec in session.query(CycleCalendar).order_by(CycleCalendar.year)
+    )
+
+    return ReferenceData(
+        stems=MappingProxyType(stems),
+        branches=MappingProxyType(branches),
+        divisions=MappingProxyType(divisions),
+        cycle=cycle,
+    )
+
+
+@timed('db')
+def reload_reference_data() -> ReferenceData:
+    """
+    Re-read every reference table and swap in the new registry.
+    """
+    global _reference_data
+    with _reference_lock:
+        with data_session() as session:
+            _reference_data = _load_reference_data(session)
+        return _reference_data
+
+
+def get_reference_data() -> ReferenceData:
+    """
+    Registry of the reference tables, loaded on first use.
+    """
+    if _reference_data is None:
+        return reload_reference_data()
+    return _reference_data
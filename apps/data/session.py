@@ -0,0 +1,50 @@
+"""
+Sessions for the read-only reference data in the ``data_db`` bind.
+
+Inside a Flask app context the app's own scoped session is reused; outside
+of one (CLI, batch jobs) a standalone session factory is built once per
+process, so no Flask app has to be bootstrapped just to read the tables.
+"""
+import threading
+from contextlib import contextmanager
+
+from flask import has_app_context
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from apps import db
+from apps.config import config_dict
+
+_session_factory = None
+_session_factory_lock = threading.Lock()
+
+
+def standalone_session_factory(config=None):
+    """
+    Session factory bound to the data database, created on first use.
+    """
+    global _session_factory
+    if _session_factory is None:
+        with _session_factory_lock:
+            if _session_factory is None:
+                config = config or config_dict['Debug']
+                binds = getattr(config, 'SQLALCHEMY_BINDS', None) or {}
+                uri = binds.get('data_db', config.SQLALCHEMY_DATABASE_URI)
+                _session_factory = sessionmaker(bind=create_engine(uri))
+    return _session_factory
+
+
+@contextmanager
+def data_session():
+    """
+    Yield a session for reference-data queries.
+    """
+    if has_app_context():
+        yield db.session
+        return
+
+    session = standalone_session_factory()()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,51 @@
+import hashlib
+from functools import wraps
+
+from flask import request, make_response
+
+from calculation.version import ALGORITHM_VERSION
+
+# Responses of deterministic endpoints only change with ALGORITHM_VERSION.
+# Clients keep them for an hour and then revalidate with If-None-Match, so a
+# version bump reaches them within the hour; the nginx tier keeps them for
+# 30 days and is purged when the version changes.
+CLIENT_MAX_AGE = 3600
+SHARED_MAX_AGE = 30 * 24 * 3600
+
+
+def request_etag():
+    """
+    Strong ETag for the current GET request: path, query arguments (sorted)
+    and the algorithm version.  Reference data is not part of it; bump
+    ALGORITHM_VERSION after re-seeding the data database.
+    """
+    args = sorted(request.args.items(multi=True))
+    key = repr((ALGORITHM_VERSION, request.path, args)).encode('utf-8')
+    return hashlib.sha256(key).hexdigest()[:32]
+
+
+def deterministic(func):
+    """
+    Mark a view whose response is a pure function of its query arguments:
+    successful responses get a strong ETag and a public Cache-Control
+    (short for clients, long for shared caches), and a matching
+    If-None-Match is answered with 304 without calling the view.
+    """
+    @wraps(func)
+    def decorated(*args, **kwargs):
+        etag = request_etag()
+
+        if etag in request.if_none_match:
+            response = make_response('', 304)
+        else:
+            response = make_response(func(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = CLIENT_MAX_AGE
+        response.cache_control.s_maxage = SHARED_MAX_AGE
+        return response
+
+    return decorated
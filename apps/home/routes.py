@@ -4,15 +4,28 @@ Copyright (c) 2019 - present AppSeed.us
 """
 
 from apps.home import blueprint
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for
+from apps.home.decorators import deterministic
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 from apps import db
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from calculation.miscellaneous import get_chinese_season_by_month
-from calculation.moon_phase import moon_phase
-from calculation.chinese_calendar import chinese_from_fixed, fixed_from_gregorian
-from calculation.bazi import calculate_bazi
+from calculation.moon_phase import moon_phase, moon_phase_many
+from calculation.moon_events import moon_events_for_month
+from calculation.chinese_calendar import (
+    chinese_from_fixed, chinese_from_fixed_many, fixed_from_gregorian, ChineseDate,
+    chinese_cycle_year, fixed_from_chinese, gregorian_from_fixed, sexagenary_name,
+    check_supported_year,
+)
+from calculation.bazi import bazi_args, calculate_bazi, calculate_bazi_many
+from calculation.calendar_export import export_calendar
+from calculation.result_cache import result_cache
+
+# Results shared across requests (and across workers with the SQLite backend)
+cached_moon_phase = result_cache.cached('moon_phase')(moon_phase)
+cached_chinese_from_fixed = result_cache.cached('chinese_from_fixed', decode=ChineseDate._make)(chinese_from_fixed)
+cached_calculate_bazi = result_cache.cached('bazi')(calculate_bazi)
 
 @blueprint.route('/')
 @blueprint.route('/index')
@@ -21,6 +34,7 @@ def index():
     return render_template('pages/index.html', segment='lunar_bazi')
 
 @blueprint.route('/api/moon_phase')
+@deterministic
 def api_moon_phase():
     date_str = request.args.get('date')
     time_str = request.args.get('time', None)
@@ -36,34 +50,203 @@ def api_moon_phase():
     dt = dt.replace(tzinfo=timezone.utc)
 
     # compute
-    result = moon_phase(dt)
+    result = cached_moon_phase(dt)
     return jsonify(result)
 
+@blueprint.route('/api/moon_calendar')
+@deterministic
+def api_moon_calendar():
+    """
+    Moon phase at 00:00 UTC for every day of `year`, or of `month` in it.
+    """
+    try:
+        year = int(request.args['year'])
+        month = request.args.get('month')
+        if month is None:
+            first, last = date(year, 1, 1), date(year + 1, 1, 1)
+        else:
+            first = date(year, int(month), 1)
+            last = date(year + (first.month == 12), first.month % 12 + 1, 1)
+    except KeyError:
+        return jsonify({"error": "missing year"}), 400
+    except ValueError:
+        return jsonify({"error": "invalid year or month"}), 400
+
+    start = datetime.combine(first, datetime.min.time(), tzinfo=timezone.utc)
+    stop = datetime.combine(last, datetime.min.time(), tzinfo=timezone.utc)
+    phases = moon_phase_many(start=start, stop=stop)
+
+    days = []
+    for i, jd in enumerate(phases["julian_day"].tolist()):
+        days.append({
+            "date":         date.fromordinal(first.toordinal() + i).isoformat(),
+            "julian_day":   jd,
+            "age_days":     float(phases["age_days"][i]),
+            "illumination": float(phases["illumination"][i]),
+            "phase_name":   str(phases["phase_name"][i]),
+        })
+    return jsonify({"days": days})
+
+@blueprint.route('/api/moon_events')
+@deterministic
+def api_moon_events():
+    """
+    Exact instants (UTC) of the new moons, quarters and full moons in
+    `month` of `year`.
+    """
+    try:
+        year = int(request.args['year'])
+        month = int(request.args['month'])
+        date(year, month, 1)
+    except KeyError:
+        return jsonify({"error": "missing year or month"}), 400
+    except ValueError:
+        return jsonify({"error": "invalid year or month"}), 400
+
+    return jsonify({"events": moon_events_for_month(year, month)})
+
+# Upper bound on the number of dates converted by one batch request
+MAX_BATCH_DATES = 20000
+
+
+def _chinese_date_payload(cd):
+    return {
+      "cycle":         cd.cycle,
+      "year":          cd.year,
+      "month":         cd.month,
+      "is_leap_month": cd.is_leap_month,
+      "day":           cd.day,
+      "name":          cd.name,
+      "chinese_season": get_chinese_season_by_month(cd.month)
+    }
+
+def _fixed_from_date_str(date_str):
+    """
+    Fixed date of a "YYYY-MM-DD" string; ValueError with a message fit for
+    the client if it is malformed or outside the supported years.
+    """
+    try:
+        dt = datetime.strptime(date_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ValueError("dates must be formatted YYYY-MM-DD")
+    check_supported_year(dt.year)
+    return fixed_from_gregorian(dt.year, dt.month, dt.day)
+
 @blueprint.route('/api/chinese_date')
+@deterministic
 def api_chinese_date():
     date_str = request.args.get('date')
     if not date_str:
         return jsonify({"error":"missing date"}), 400
 
     # parse date (you already have this)
-    y, m, d = map(int, date_str.split('-'))
+    try:
+        y, m, d = map(int, date_str.split('-'))
+        date(y, m, d)
+        check_supported_year(y)
+    except ValueError as e:
+        return jsonify({"error": f"invalid date: {e}"}), 400
     fixed = fixed_from_gregorian(y, m, d)
-    cd = chinese_from_fixed(fixed)
+    cd = cached_chinese_from_fixed(fixed)
 
-    # **HERE** call your new function
-    season = get_chinese_season_by_month(cd.month)
+    return jsonify(_chinese_date_payload(cd))
 
-    return jsonify({
-      "cycle":         cd.cycle,
-      "year":          cd.year,
-      "month":         cd.month,
-      "is_leap_month": cd.is_leap_month,
-      "day":           cd.day,
-      "name":          cd.name,
-      "chinese_season": season   # ← new field
-    })
+@blueprint.route('/api/gregorian_date')
+@deterministic
+def api_gregorian_date():
+    """
+    Gregorian date of a Chinese date. `year` is the year in `cycle`, or,
+    without `cycle`, the Gregorian year in which the Chinese year begins;
+    `leap` selects the leap month.
+    """
+    try:
+        year = int(request.args['year'])
+        month = int(request.args['month'])
+        day = int(request.args['day'])
+        cycle = request.args.get('cycle')
+    except KeyError:
+        return jsonify({"error": "missing year, month or day"}), 400
+    except ValueError:
+        return jsonify({"error": "year, month and day must be integers"}), 400
+    leap = request.args.get('leap', 'false').lower() in ('1', 'true', 'yes')
+
+    try:
+        if cycle is None:
+            cycle, year = chinese_cycle_year(year)
+        else:
+            cycle = int(cycle)
+        fixed = fixed_from_chinese(cycle, year, month, leap, day)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    g_year, g_month, g_day = gregorian_from_fixed(fixed)
+    payload = _chinese_date_payload(ChineseDate(cycle, year, month, leap, day, sexagenary_name(year)))
+    payload["date"] = f"{g_year:04d}-{g_month:02d}-{g_day:02d}"
+    return jsonify(payload)
+
+@blueprint.route('/api/chinese_date/batch', methods=['POST'])
+def api_chinese_date_batch():
+    """
+    Convert many dates at once. The JSON body is either
+    {"dates": ["YYYY-MM-DD", ...]} or {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
+    (inclusive); results come back in the same order.
+    """
+    body = request.get_json(silent=True) or {}
+
+    try:
+        if 'dates' in body:
+            date_strs = body['dates']
+            if not isinstance(date_strs, list):
+                return jsonify({"error": "dates must be a list"}), 400
+            if len(date_strs) > MAX_BATCH_DATES:
+                return jsonify({"error": f"at most {MAX_BATCH_DATES} dates per request"}), 400
+            fixed_dates = [_fixed_from_date_str(s) for s in date_strs]
+        elif 'start' in body and 'end' in body:
+            start = _fixed_from_date_str(body['start'])
+            end = _fixed_from_date_str(body['end'])
+            if end < start:
+                return jsonify({"error": "end is before start"}), 400
+            if end - start + 1 > MAX_BATCH_DATES:
+                return jsonify({"error": f"at most {MAX_BATCH_DATES} dates per request"}), 400
+            fixed_dates = list(range(start, end + 1))
+        else:
+            return jsonify({"error": "expected dates or start/end"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = []
+    for fixed, cd in zip(fixed_dates, chinese_from_fixed_many(fixed_dates)):
+        payload = _chinese_date_payload(cd)
+        payload["date"] = date.fromordinal(fixed).isoformat()
+        results.append(payload)
+    return jsonify({"results": results})
+
+@blueprint.route('/api/calendar/export')
+def api_calendar_export():
+    """
+    Stream one NDJSON record per day from `start` to `end` (inclusive).
+    """
+    start_str = request.args.get('start')
+    end_str = request.args.get('end')
+    if not start_str or not end_str:
+        return jsonify({"error": "missing start or end"}), 400
+
+    try:
+        start = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({"error": "dates must be formatted YYYY-MM-DD"}), 400
+    if end < start:
+        return jsonify({"error": "end is before start"}), 400
+    try:
+        lines = export_calendar(start, end)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
 
 @blueprint.route('/api/bazi')
+@deterministic
 def api_bazi():
     date_str = request.args.get('date')
     time_str = request.args.get('time', None)
@@ -71,19 +254,47 @@ def api_bazi():
     if not date_str:
         return jsonify({"error": "missing date"}), 400
 
-    # parse date
-    y, m, d = map(int, date_str.split('-'))
-
-    # parse time if provided
-    if time_str and time_str != 'Unknown Hour':
-        hour, minute = map(int, time_str.split(':'))
-    else:
-        hour, minute = None, 0
+    # parse and range-check date and time
+    try:
+        y, m, d, hour, minute = bazi_args({"date": date_str, "time": time_str})
+    except ValueError as e:
+        return jsonify({"error": f"invalid date or time: {e}"}), 400
 
     # delegate to your bazi calc
-    result = calculate_bazi(y, m, d, hour, minute)
+    result = cached_calculate_bazi(y, m, d, hour, minute)
     return jsonify(result)
 
+@blueprint.route('/api/bazi/batch', methods=['POST'])
+def api_bazi_batch():
+    """
+    Charts for many birth records. The JSON body is
+    {"records": [{"date": "YYYY-MM-DD", "time": "HH:MM"}, ...]} (time is
+    optional); results come back in the same order, with {"error": ...}
+    for records that could not be read.
+    """
+    body = request.get_json(silent=True) or {}
+    records = body.get('records')
+    if not isinstance(records, list):
+        return jsonify({"error": "records must be a list"}), 400
+    if len(records) > MAX_BATCH_DATES:
+        return jsonify({"error": f"at most {MAX_BATCH_DATES} records per request"}), 400
+
+    # Serial in the request worker: a process pool per request would multiply
+    # forks under concurrent requests, and 20000 records take about 1.5 s
+    return jsonify({"results": calculate_bazi_many(records, max_workers=1)})
+
+@blueprint.route('/api/result_cache/stats')
+def api_result_cache_stats():
+    """
+    Hit/miss counts of the result cache in this worker.
+    """
+    backend = result_cache.backend
+    return jsonify({
+        "backend": type(backend).__name__ if backend is not None else None,
+        "entries": len(backend) if backend is not None else 0,
+        "namespaces": result_cache.stats(),
+    })
+
 @blueprint.route('/profile', methods=['GET', 'POST'])
 @login_required
 def profile():
@@ -0,0 +1,164 @@
+"""
+Prometheus metrics at ``/metrics``.
+
+Enabled with ``CALCULATION_METRICS=1``.  Under gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty directory shared by the workers so
+every worker writes its samples there and ``/metrics`` reports the sum over
+all of them (see gunicorn-cfg.py for the matching ``child_exit`` hook).
+
+Per-request evaluation and query counts are differences of process-wide
+counters, which assumes one request at a time per worker (gunicorn's sync
+workers).  Cache hit ratios follow from the hit/miss counters, e.g.
+``rate(calculation_cache_hits_total[5m]) / (rate(calculation_cache_hits_total[5m])
++ rate(calculation_cache_misses_total[5m]))``.
+
+``/metrics`` is served without authentication.  It must only be reachable
+from the internal network: nginx/appseed-app.conf denies it to the outside,
+and the app port (5005) must not be published beyond the proxy.
+"""
+import os
+import threading
+import time
+
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from calculation import counters
+from calculation.chinese_calendar import chinese_solar_terms, chinese_year_info, nth_new_moon
+from calculation.result_cache import result_cache
+from calculation.solar_terms import month_boundaries
+
+# Memoized calendar structures reported as caches, by name
+LRU_CACHES = {
+    'nth_new_moon':         nth_new_moon,
+    'chinese_year_info':    chinese_year_info,
+    'chinese_solar_terms':  chinese_solar_terms,
+    'month_boundaries':     month_boundaries,
+}
+
+EVALUATION_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_db_queries = 0
+_db_queries_lock = threading.Lock()
+
+# Prometheus metric objects, created once per process (see _metrics)
+_METRICS = None
+# Cache totals already reported by this process
+_reported = {}
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    global _db_queries
+    with _db_queries_lock:
+        _db_queries += 1
+
+
+def _cache_totals() -> dict:
+    """
+    Cumulative (hits, misses) per cache in this process.
+    """
+    totals = {}
+    for name, func in LRU_CACHES.items():
+        info = func.cache_info()
+        totals[name] = (info.hits, info.misses)
+    for namespace, stats in result_cache.stats().items():
+        totals[f"result_cache:{namespace}"] = (stats["hits"], stats["misses"])
+    return totals
+
+
+def _metrics() -> dict:
+    """
+    The metric objects, registered on the default registry on first use.
+    Later apps in the same process (tests, the Flask CLI) share them, since
+    registering the same names twice is an error.
+    """
+    global _METRICS
+    if _METRICS is None:
+        from prometheus_client import Counter, Histogram
+
+        _METRICS = {
+            'request_latency': Histogram(
+                'http_request_duration_seconds', 'Request latency by endpoint',
+                ['endpoint', 'method', 'status']),
+            'evaluations_per_request': Histogram(
+                'calculation_evaluations_per_request', 'Series evaluations in one request',
+                ['endpoint', 'function'], buckets=EVALUATION_BUCKETS),
+            'evaluations_total': Counter(
+                'calculation_evaluations_total', 'Series evaluations', ['function']),
+            'queries_per_request': Histogram(
+                'db_queries_per_request', 'SQL statements executed in one request',
+                ['endpoint'], buckets=QUERY_BUCKETS),
+            'queries_total': Counter('db_queries_total', 'SQL statements executed'),
+            'cache_hits': Counter('calculation_cache_hits_total', 'Cache hits', ['cache']),
+            'cache_misses': Counter('calculation_cache_misses_total', 'Cache misses', ['cache']),
+        }
+    return _METRICS
+
+
+def configure_metrics(app):
+    """
+    Register the request hooks and the /metrics endpoint.
+    """
+    if not counters.enabled:
+        return
+
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    instruments = _metrics()
+    request_latency = instruments['request_latency']
+    evaluations_per_request = instruments['evaluations_per_request']
+    evaluations_total = instruments['evaluations_total']
+    queries_per_request = instruments['queries_per_request']
+    queries_total = instruments['queries_total']
+    cache_hits = instruments['cache_hits']
+    cache_misses = instruments['cache_misses']
+
+    # The listener is global to every Engine, so add it only once per process
+    if not event.contains(Engine, 'before_cursor_execute', _count_query):
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+
+    @app.before_request
+    def start_metrics():
+        g.metrics_start = (time.perf_counter(), counters.snapshot(), _db_queries)
+
+    @app.after_request
+    def record_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is None or request.path == '/metrics':
+            return response
+        started, evaluations, queries = start
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+        request_latency.labels(endpoint, request.method, response.status_code).observe(
+            time.perf_counter() - started)
+        for function, count in counters.snapshot().items():
+            delta = count - evaluations.get(function, 0)
+            evaluations_per_request.labels(endpoint, function).observe(delta)
+            if delta:
+                evaluations_total.labels(function).inc(delta)
+        delta = _db_queries - queries
+        queries_per_request.labels(endpoint).observe(delta)
+        if delta:
+            queries_total.inc(delta)
+
+        for cache, (hits, misses) in _cache_totals().items():
+            last_hits, last_misses = _reported.get(cache, (0, 0))
+            if hits > last_hits:
+                cache_hits.labels(cache).inc(hits - last_hits)
+            if misses > last_misses:
+                cache_misses.labels(cache).inc(misses - last_misses)
+            _reported[cache] = (hits, misses)
+        return response
+
+    def metrics():
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            from prometheus_client import multiprocess
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# astronomy_array.py
+#
+# NumPy versions of the solar and lunar longitude series in chinese_calendar,
+# for evaluating many moments at once (table building, range queries).
+# Each function takes an array of moments (fixed dates, UT) and agrees with
+# its scalar counterpart to well within 1e-9 degrees.
+
+import numpy as np
+
+from calculation.chinese_calendar import (
+    ephemeris_correction_for_year, j2000, poly,
+    mean_lunar_longitude, lunar_elongation, solar_anomaly, lunar_anomaly, moon_node,
+    solar_longitude_coefficients, solar_longitude_multipliers, solar_longitude_addends,
+    lunar_sine_coefficients, lunar_args_elongation, lunar_args_solar_anomaly,
+    lunar_args_lunar_anomaly, lunar_args_moon_node,
+)
+from calculation.gregorian_array import gregorian_year_from_fixed_array
+
+# The scalar series zip their term lists, so only the common prefix is used.
+_solar_terms = min(len(solar_longitude_coefficients),
+                   len(solar_longitude_multipliers),
+                   len(solar_longitude_addends))
+_SOLAR_COEFFICIENTS = np.array(solar_longitude_coefficients[:_solar_terms], dtype=float)
+_SOLAR_MULTIPLIERS  = np.array(solar_longitude_multipliers[:_solar_terms], dtype=float)
+_SOLAR_ADDENDS      = np.array(solar_longitude_addends[:_solar_terms], dtype=float)
+
+_lunar_terms = min(len(lunar_sine_coefficients), len(lunar_args_elongation),
+                   len(lunar_args_solar_anomaly), len(lunar_args_lunar_anomaly),
+                   len(lunar_args_moon_node))
+_LUNAR_SINE_COEFFICIENTS = np.array(lunar_sine_coefficients[:_lunar_terms], dtype=float)
+# One row per fundamental argument: D, M, M', F
+_LUNAR_ARGUMENTS = np.array([
+    lunar_args_elongation[:_lunar_terms],
+    lunar_args_solar_anomaly[:_lunar_terms],
+    lunar_args_lunar_anomaly[:_lunar_terms],
+    lunar_args_moon_node[:_lunar_terms],
+], dtype=float)
+_LUNAR_E_POWERS = np.abs(_LUNAR_ARGUMENTS[1])
+
+
+def ephemeris_correction_array(tees):
+    """
+    ΔT (days) for each moment; ΔT only depends on the Gregorian year, so
+    it is evaluated once per distinct year.
+    """
+    years = gregorian_year_from_fixed_array(np.floor(tees).astype(np.int64))
+    distinct, index = np.unique(years, return_inverse=True)
+    per_year = np.array([ephemeris_correction_for_year(int(y)) for y in distinct])
+    return per_year[index.reshape(years.shape)]
+
+
+def julian_centuries_array(tees):
+    return (tees + ephemeris_correction_array(tees) - j2000) / 36525.0
+
+
+def _aberration(c):
+    return -0.0000974 * np.cos(np.radians(177.63 + 35999.01848 * c + 0.005575))
+
+
+def _nutation(c):
+    A = np.radians(124.90 + (-1934.134) * c + 0.002063 * c * c)
+    B = np.radians(201.11 + 72001.5377 * c + 0.00057 * c * c)
+    return -0.004778 * np.sin(A) + -0.0003667 * np.sin(B)
+
+
+def solar_longitude_array(tees):
+    """
+    Solar longitude (degrees) at each moment in `tees`.
+    """
+    tees = np.asarray(tees, dtype=float)
+    c = julian_centuries_array(tees)
+    angles = _SOLAR_ADDENDS + c[..., np.newaxis] * _SOLAR_MULTIPLIERS
+    sigma = np.sin(np.radians(angles)) @ _SOLAR_COEFFICIENTS
+    lam = (282.7771834 + 36000.76953744 * c
+           + 0.000005729577951308232 * sigma)
+    lam += _aberration(c) + _nutation(c)
+    return lam % 360
+
+
+def lunar_longitude_array(tees):
+    """
+    Lunar longitude (degrees) at each moment in `tees`.
+    """
+    tees = np.asarray(tees, dtype=float)
+    c = julian_centuries_array(tees)
+
+    cap_L_prime = mean_lunar_longitude(c)
+    fundamentals = np.stack([lunar_elongation(c), solar_anomaly(c),
+                             lunar_anomaly(c), moon_node(c)], axis=-1)
+    cap_F = fundamentals[..., 3]
+    cap_E = poly(c, [1, -0.002516, -0.0000074])
+
+    angles = fundamentals @ _LUNAR_ARGUMENTS
+    factors = cap_E[..., np.newaxis] ** _LUNAR_E_POWERS
+    correction = (factors * np.sin(np.radians(angles))) @ _LUNAR_SINE_COEFFICIENTS / 1_000_000.0
+
+    venus      = (3958/1_000_000) * np.sin(np.radians(119.75 + 131.849 * c))
+    jupiter    = (318/1_000_000)  * np.sin(np.radians(53.09  + 479264.29 * c))
+    flat_earth = (1962/1_000_000) * np.sin(np.radians(cap_L_prime - cap_F))
+
+    return (cap_L_prime + correction + venus + jupiter + flat_earth +
+            _aberration(c) + _nutation(c)) % 360.0
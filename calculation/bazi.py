@@ -1,16 +1,28 @@
 #!/usr/bin/env python3
 # bazi_calc.py
-from sqlalchemy import nullsfirst
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date as gregorian_date
 
-from apps import create_app, db
-from apps.config import config_dict
-from calculation.chinese_calendar import fixed_from_gregorian, chinese_from_fixed, ChineseDate
-from apps.data.tables import Stems, HiddenStem, StemOrgan, BranchOrgan
+from apps.data.registry import get_reference_data
+from calculation.chinese_calendar import (
+    check_supported_year, fixed_from_gregorian, sexagenary_stems, sexagenary_branches,
+)
+from calculation.solar_terms import moment_from_local, solar_month_at
+from calculation.timing import timed
+
+# Fixed date whose day is the last of a sexagenary cycle (Gui-Hai)
+DAY_CYCLE_EPOCH = 45
+
+# Batches smaller than this are computed in-process
+PARALLEL_MIN_RECORDS = 2000
+# Chunks handed to each worker (per worker), to even out the load
+CHUNKS_PER_WORKER = 4
 
 
 def lookup_stem(pinyin: str) -> dict:
-    rec = db.session.query(StemOrgan).filter_by(pinyin=pinyin).first()
-    if rec:
+    rec = get_reference_data().stems.get(pinyin)
+    if rec and rec.organ is not None:
         return {
             'pinyin': rec.pinyin,
             'chinese_char': rec.chinese_char,
@@ -21,8 +33,8 @@ def lookup_stem(pinyin: str) -> dict:
 
 
 def lookup_branch(pinyin: str) -> dict:
-    rec = db.session.query(BranchOrgan).filter_by(pinyin=pinyin).first()
-    if rec:
+    rec = get_reference_data().branches.get(pinyin)
+    if rec and rec.organ is not None:
         return {
             'pinyin': rec.pinyin,
             'chinese_char': rec.chinese_char,
@@ -32,41 +44,94 @@ def lookup_branch(pinyin: str) -> dict:
     return {'pinyin': pinyin}
 
 
-def calculate_year_pillar(date: ChineseDate) -> dict:
+def calculate_year_pillar(date: int, hour: int = None, minute: int = 0) -> dict:
     """
-    Return the 'year' pillar dict for the given Gregorian date.
+    Return the 'year' pillar for fixed `date` at China standard time
+    `hour`:`minute`.  The year is the solar year, which starts at Lichun,
+    so it always agrees with the month pillar.
     """
-
-    cd = chinese_from_fixed(date)                # ChineseDate
-    stem_pinyin, branch_pinyin = cd.name.split('-')
+    solar_year, _ = solar_month_on(date, hour, minute)
+    stem_pinyin = sexagenary_stems[(solar_year - 4) % 10]
+    branch_pinyin = sexagenary_branches[(solar_year - 4) % 12]
 
     # Great Movement (GM)
-    gm_rec = db.session.query(Stems).filter_by(name=stem_pinyin).first()
-    gm = gm_rec.gm if gm_rec else None
+    stem_rec = get_reference_data().stems.get(stem_pinyin)
+    gm = stem_rec.gm if stem_rec else None
 
-    # Stem & Branch info
-    stem_info   = lookup_stem(stem_pinyin)
-    branch_info = lookup_branch(branch_pinyin)
+    return {"GM": gm, **pillar(stem_pinyin, branch_pinyin)}
 
-    # Hidden stems
-    hs_rec = db.session.query(HiddenStem).filter_by(branch=branch_pinyin).first()
-    hidden_pinyins = hs_rec.hidden_stems if hs_rec and hs_rec.hidden_stems else []
-    hidden_info = [lookup_stem(h) for h in hidden_pinyins]
+
+def solar_month_on(date: int, hour: int = None, minute: int = 0):
+    """
+    (solar_year, month) of `solar_month_at` for fixed `date` at China
+    standard time `hour`:`minute` (midday when the hour is unknown).
+    """
+    return solar_month_at(moment_from_local(date, 12 if hour is None else hour, minute))
+
+
+def pillar(stem_pinyin: str, branch_pinyin: str) -> dict:
+    """
+    Stem, branch and hidden-stem info for one pillar.
+    """
+    branch_rec = get_reference_data().branches.get(branch_pinyin)
+    hidden_pinyins = branch_rec.hidden_stems if branch_rec else ()
 
     return {
-        "GM": gm,
-        "Stem": stem_info,
-        "Branch": branch_info,
-        "HS": hidden_info
+        "Stem": lookup_stem(stem_pinyin),
+        "Branch": lookup_branch(branch_pinyin),
+        "HS": [lookup_stem(h) for h in hidden_pinyins]
     }
 
-def calculate_month_pillar(date: ChineseDate) -> dict:
 
+def calculate_month_pillar(date: int, hour: int = None, minute: int = 0) -> dict:
+    """
+    Return the 'month' pillar for fixed `date` at China standard time
+    `hour`:`minute` (midday when the hour is unknown).  The month is the
+    one opened by the last jie (sectional solar term) before that moment.
+    """
+    solar_year, branch = solar_month_on(date, hour, minute)
+
+    # Five tigers: the Yin month stem follows the solar year's stem
+    year_stem = (solar_year - 4) % 10
+    stem = (2 * year_stem + 2 + (branch - 2) % 12) % 10
+
+    return pillar(sexagenary_stems[stem], sexagenary_branches[branch])
+
+
+def day_stem_branch(date: int):
+    """
+    (stem, branch) indices of the sexagenary day of fixed `date`.
+    """
+    n = date - DAY_CYCLE_EPOCH - 1
+    return n % 10, n % 12
 
 
-    return {}
+def calculate_day_pillar(date: int) -> dict:
+    """
+    Return the 'day' pillar for fixed `date`.
+    """
+    stem, branch = day_stem_branch(date)
+    return pillar(sexagenary_stems[stem], sexagenary_branches[branch])
 
 
+def calculate_hour_pillar(date: int, hour: int = None) -> dict:
+    """
+    Return the 'hour' pillar for `hour` on fixed `date`, or {} when the
+    hour is unknown.  The Zi double-hour starts at 23:00, which takes its
+    stem from the following day.
+    """
+    if hour is None:
+        return {}
+    branch = ((hour + 1) // 2) % 12
+    day_stem, _ = day_stem_branch(date + 1 if hour == 23 else date)
+
+    # Five rats: the Zi hour stem follows the day stem
+    stem = (2 * day_stem + branch) % 10
+
+    return pillar(sexagenary_stems[stem], sexagenary_branches[branch])
+
+
+@timed('bazi')
 def calculate_bazi(year: int,
                    month: int,
                    day: int,
@@ -74,21 +139,99 @@ def calculate_bazi(year: int,
                    minute: int = 0) -> dict:
     """
     Calculate the Four Pillars (BaZi) for a given date/time.
-    Currently only implements the year pillar.
     """
-    # Ensure Flask app context for DB lookups
-    app = create_app(config_dict['Debug'])
-    with app.app_context():
-        # Rata Die for this date
-        fixed = fixed_from_gregorian(year, month, day)
-        year_pillar = calculate_year_pillar(fixed)
+    # Rata Die for this date
+    fixed = fixed_from_gregorian(year, month, day)
+    year_pillar = calculate_year_pillar(fixed, hour, minute)
+    month_pillar = calculate_month_pillar(fixed, hour, minute)
 
-        return {
-            "year":  year_pillar,
-            "month": {},  # TODO: call calculate_month_pillar(...)
-            "day":   {},  # TODO: call calculate_day_pillar(...)
-            "hour":  {}   # TODO: call calculate_hour_pillar(...)
-        }
+    return {
+        "year":  year_pillar,
+        "month": month_pillar,
+        "day":   calculate_day_pillar(fixed),
+        "hour":  calculate_hour_pillar(fixed, hour)
+    }
+
+
+def bazi_args(record: dict) -> tuple:
+    """
+    Validated (year, month, day, hour, minute) from a birth record: either
+    year, month, day[, hour, minute] or the API's "YYYY-MM-DD" date and
+    "HH:MM" time strings.
+    """
+    if not isinstance(record, dict):
+        raise TypeError("expected an object")
+    if 'date' in record:
+        year, month, day = map(int, record['date'].split('-'))
+        time_str = record.get('time')
+        if time_str and time_str != 'Unknown Hour':
+            hour, minute = map(int, time_str.split(':'))
+        else:
+            hour, minute = None, 0
+    else:
+        year, month, day = int(record['year']), int(record['month']), int(record['day'])
+        hour = record.get('hour')
+        hour = None if hour is None else int(hour)
+        minute = int(record.get('minute') or 0)
+
+    gregorian_date(year, month, day)
+    check_supported_year(year)
+    if hour is not None and not 0 <= hour <= 23:
+        raise ValueError("hour must be 0..23")
+    if not 0 <= minute <= 59:
+        raise ValueError("minute must be 0..59")
+    return year, month, day, hour, minute
+
+
+def _bazi_or_error(args) -> dict:
+    if isinstance(args, Exception):
+        return {"error": str(args)}
+    try:
+        return calculate_bazi(*args)
+    except (TypeError, ValueError, KeyError) as e:
+        return {"error": str(e)}
+
+
+def _bazi_chunk(chunk: list) -> list:
+    return [_bazi_or_error(args) for args in chunk]
+
+
+def calculate_bazi_many(records, max_workers: int = None) -> list:
+    """
+    Calculate the Four Pillars for many birth records (dicts with year,
+    month, day and optional hour, minute).  Records are worked in date order
+    so per-year calendar and solar-term structures are built once; large
+    batches are split into contiguous chunks over a process pool.  Results
+    come back in input order, with {"error": ...} for invalid records.
+    """
+    parsed = []
+    for record in records:
+        try:
+            parsed.append(bazi_args(record))
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            parsed.append(ValueError(f"invalid record: {e}"))
+
+    valid = [i for i, args in enumerate(parsed) if not isinstance(args, Exception)]
+    valid.sort(key=lambda i: parsed[i][:3])
+    order = valid + [i for i, args in enumerate(parsed) if isinstance(args, Exception)]
+    ordered = [parsed[i] for i in order]
+
+    workers = max_workers or os.cpu_count() or 1
+    if len(valid) < PARALLEL_MIN_RECORDS or workers < 2:
+        computed = _bazi_chunk(ordered)
+    else:
+        # Load the registry first so forked workers inherit it; with the
+        # spawn or forkserver start methods each worker reads it on first use
+        get_reference_data()
+        size = -(-len(ordered) // (workers * CHUNKS_PER_WORKER))
+        chunks = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = [r for part in pool.map(_bazi_chunk, chunks) for r in part]
+
+    results = [None] * len(parsed)
+    for i, result in zip(order, computed):
+        results[i] = result
+    return results
 
 
 if __name__ == "__main__":
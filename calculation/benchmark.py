@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# benchmark.py
+#
+# Timing suite for the calendar, moon-phase and BaZi hot paths.  Each
+# benchmark runs over fixed date corpora, reports ops/sec and latency
+# percentiles, can save its results as JSON, and exits non-zero when a run is
+# slower than a saved baseline by more than the threshold:
+#
+#     python -m calculation.benchmark --output baseline.json
+#     python -m calculation.benchmark --baseline baseline.json --threshold 0.2
+#
+# Memoized calendar structures are cleared before every benchmark, so results
+# do not depend on which benchmarks ran earlier.  Each benchmark runs in two
+# modes: "warm" times passes after a warm-up (steady state of a busy worker),
+# "cold" times passes that each start from empty caches (a fresh worker), so
+# the solstice and new-moon searches behind the caches are measured too.
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from calculation.chinese_calendar import (
+    chinese_from_fixed, chinese_solar_terms, chinese_winter_solstice_on_or_before,
+    chinese_year_info, chinese_year_months, fixed_from_gregorian, gregorian_from_fixed,
+    lunar_longitude, lunation_index_before, nth_new_moon, solar_longitude,
+)
+from calculation.moon_events import lunation_phases
+from calculation.moon_phase import moon_phase
+from calculation.solar_terms import month_boundaries
+from calculation.version import ALGORITHM_VERSION
+
+# Corpora: one date repeated, every day of one year, random days 1900-2100
+SINGLE_DATE = (2025, 7, 10)
+SINGLE_REPEAT = 200
+SWEEP_YEAR = 2025
+RANDOM_SIZE = 1000
+RANDOM_SEED = 20250710
+
+
+def corpora() -> dict:
+    single = fixed_from_gregorian(*SINGLE_DATE)
+    sweep_start = fixed_from_gregorian(SWEEP_YEAR, 1, 1)
+    sweep_end = fixed_from_gregorian(SWEEP_YEAR + 1, 1, 1)
+    rng = random.Random(RANDOM_SEED)
+    lo, hi = fixed_from_gregorian(1900, 1, 1), fixed_from_gregorian(2100, 12, 31)
+    return {
+        "single":    [single] * SINGLE_REPEAT,
+        "same_year": list(range(sweep_start, sweep_end)),
+        "random":    [rng.randint(lo, hi) for _ in range(RANDOM_SIZE)],
+    }
+
+
+def _calculate_bazi(date):
+    # Imported on use: it needs the reference-data database
+    from calculation.bazi import calculate_bazi
+    return calculate_bazi(*gregorian_from_fixed(date), 12, 0)
+
+
+# Each benchmark maps a fixed date to one call of the function under test.
+# nth_new_moon is timed without its cache, so it measures the series itself.
+BENCHMARKS = {
+    "solar_longitude":  lambda date: solar_longitude(date + 0.5),
+    "lunar_longitude":  lambda date: lunar_longitude(date + 0.5),
+    "nth_new_moon":     lambda date: nth_new_moon.__wrapped__(lunation_index_before(date)),
+    "chinese_winter_solstice_on_or_before": chinese_winter_solstice_on_or_before,
+    "chinese_from_fixed": chinese_from_fixed,
+    "moon_phase":       lambda date: moon_phase(datetime(*gregorian_from_fixed(date), tzinfo=timezone.utc)),
+    "calculate_bazi":   _calculate_bazi,
+}
+
+
+# Memoized functions cleared before each benchmark and each cold pass
+MEMOIZED = (nth_new_moon, chinese_year_info, chinese_solar_terms, chinese_year_months,
+            month_boundaries, lunation_phases)
+
+MODES = ("warm", "cold")
+
+
+def clear_caches():
+    for func in MEMOIZED:
+        func.cache_clear()
+
+
+def percentile(sorted_samples, q):
+    index = min(len(sorted_samples) - 1, max(0, round(q / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def run_benchmark(func, dates, repeat=3, cold=False) -> dict:
+    """
+    Time `func` over `dates`; the statistics cover `repeat` timed passes.
+    Warm runs start after one untimed pass; cold runs clear the memoized
+    structures before every pass instead.
+    """
+    clear_caches()
+    if not cold:
+        for date in dates:
+            func(date)
+
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        for date in dates:
+            start = clock()
+            func(date)
+            samples.append(clock() - start)
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "calls":      len(samples),
+        "ops_per_sec": len(samples) / (total / 1e9) if total else float('inf'),
+        "mean_us":    total / len(samples) / 1e3,
+        "p50_us":     percentile(samples, 50) / 1e3,
+        "p90_us":     percentile(samples, 90) / 1e3,
+        "p99_us":     percentile(samples, 99) / 1e3,
+        "max_us":     samples[-1] / 1e3,
+    }
+
+
+def selected(key: str, names=None, corpus_names=None, modes=None) -> bool:
+    """
+    Whether result `key` ("name/corpus/mode") is among the selection.
+    """
+    name, corpus_name, mode = key.split("/")
+    return ((not names or name in names) and (not corpus_names or corpus_name in corpus_names)
+            and (not modes or mode in modes))
+
+
+def run_suite(names=None, corpus_names=None, repeat=3, modes=None) -> dict:
+    results = {}
+    for corpus_name, dates in corpora().items():
+        for name, func in BENCHMARKS.items():
+            for mode in MODES:
+                key = f"{name}/{corpus_name}/{mode}"
+                if not selected(key, names, corpus_names, modes):
+                    continue
+                try:
+                    results[key] = run_benchmark(func, dates, repeat, cold=mode == "cold")
+                except Exception as e:
+                    results[key] = {"error": f"{type(e).__name__}: {e}"}
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "algorithm_version": ALGORITHM_VERSION,
+            "repeat": repeat,
+            "modes": list(modes or MODES),
+        },
+        "results": results,
+    }
+
+
+def regressions(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Benchmarks whose ops/sec fell more than `threshold` (a fraction) below
+    the baseline, as (key, baseline ops/sec, current ops/sec).
+    """
+    slower = []
+    for key, base in baseline.get("results", {}).items():
+        now = current["results"].get(key)
+        if not now or "ops_per_sec" not in now or "ops_per_sec" not in base:
+            continue
+        if now["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            slower.append((key, base["ops_per_sec"], now["ops_per_sec"]))
+    return slower
+
+
+def missing(current: dict, baseline: dict, names=None, corpus_names=None, modes=None) -> list:
+    """
+    Baseline benchmarks, among those selected by `names`, `corpus_names`
+    and `modes`, that produced no timing in the current run, as
+    (key, reason).
+    """
+    lost = []
+    for key, base in baseline.get("results", {}).items():
+        if "ops_per_sec" not in base:
+            continue
+        if key.count("/") != 2:
+            lost.append((key, "baseline predates warm/cold modes; regenerate it"))
+            continue
+        if not selected(key, names, corpus_names, modes):
+            continue
+        now = current["results"].get(key)
+        if now is None:
+            lost.append((key, "missing from this run"))
+        elif "ops_per_sec" not in now:
+            lost.append((key, now.get("error", "no timing")))
+    return lost
+
+
+def format_table(report: dict) -> str:
+    lines = [f"{'benchmark':<52} {'ops/sec':>12} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10}"]
+    for key, r in report["results"].items():
+        if "error" in r:
+            lines.append(f"{key:<52} {r['error']}")
+        else:
+            lines.append(f"{key:<52} {r['ops_per_sec']:>12.0f} {r['p50_us']:>10.1f} "
+                         f"{r['p90_us']:>10.1f} {r['p99_us']:>10.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calendar, moon-phase and BaZi hot paths.")
+    parser.add_argument('--bench', action='append', choices=sorted(BENCHMARKS),
+                        help="benchmark to run (repeatable; default: all)")
+    parser.add_argument('--corpus', action='append', choices=["single", "same_year", "random"],
+                        help="date corpus to use (repeatable; default: all)")
+    parser.add_argument('--mode', action='append', choices=MODES,
+                        help="warm or cold caches (repeatable; default: both)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed passes over each corpus")
+    parser.add_argument('--output', '-o', help="write the results as JSON")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed ops/sec drop against the baseline (fraction, default 0.2)")
+    args = parser.parse_args()
+
+    report = run_suite(args.bench, args.corpus, args.repeat, args.mode)
+    print(format_table(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        slower = regressions(report, baseline, args.threshold)
+        for key, before, after in slower:
+            print(f"REGRESSION {key}: {before:.0f} -> {after:.0f} ops/sec "
+                  f"({after / before - 1:+.0%})", file=sys.stderr)
+        lost = missing(report, baseline, args.bench, args.corpus, args.mode)
+        for key, reason in lost:
+            print(f"FAILED {key}: {reason}", file=sys.stderr)
+        if slower or lost:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# build_calendar_table.py
+#
+# Generate the precomputed Chinese calendar table shipped in calculation/data/.
+# Every record is computed from the astronomy functions in chinese_calendar and
+# stamped with ALGORITHM_VERSION; the loader ignores a table built by another
+# version, so re-run this after bumping it:
+#
+#     python -m calculation.build_calendar_table
+
+import argparse
+
+from calculation.chinese_calendar import (
+    CALENDAR_TABLE_HEADER, CALENDAR_TABLE_MAGIC, CALENDAR_TABLE_PATH, CALENDAR_TABLE_VERSION,
+    computed_chinese_year, computed_solar_terms, pack_calendar_year,
+)
+from calculation.version import ALGORITHM_VERSION
+
+# Solar years whose dates cover 1900-01-01 .. 2100-12-31
+FIRST_YEAR = 1899
+LAST_YEAR = 2100
+
+
+def build_calendar_table(first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> bytes:
+    """
+    Encode solar years `first_year`..`last_year` (inclusive) as a table.
+    """
+    records = []
+    for g_year in range(first_year, last_year + 1):
+        info = computed_chinese_year(g_year)
+        records.append(pack_calendar_year(info, computed_solar_terms(info.s1)))
+    header = CALENDAR_TABLE_HEADER.pack(CALENDAR_TABLE_MAGIC, CALENDAR_TABLE_VERSION,
+                                        ALGORITHM_VERSION.encode('ascii'), first_year, len(records))
+    return header + b''.join(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precomputed Chinese calendar table.")
+    parser.add_argument('--first-year', type=int, default=FIRST_YEAR)
+    parser.add_argument('--last-year', type=int, default=LAST_YEAR)
+    parser.add_argument('--output', default=CALENDAR_TABLE_PATH)
+    args = parser.parse_args()
+
+    data = build_calendar_table(args.first_year, args.last_year)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print(f"Wrote {args.last_year - args.first_year + 1} years ({len(data)} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# calendar_export.py
+#
+# Stream one JSON record per day (Chinese date, season, moon phase) for a
+# Gregorian date range as newline-delimited JSON.  Everything is a generator,
+# so memory stays constant however long the range is, and the Chinese date is
+# worked out once per lunar month and then advanced day by day.
+#
+#     python -m calculation.calendar_export 1900-01-01 2100-12-31 > calendar.ndjson
+
+import argparse
+import json
+import sys
+from bisect import bisect_right
+from datetime import date, datetime, time, timezone
+
+from calculation.chinese_calendar import (
+    check_supported_year, chinese_year_info_for, chinese_date_in_year, fixed_from_gregorian,
+)
+from calculation.miscellaneous import get_chinese_season_by_month
+from calculation.moon_phase import moon_phase
+
+
+def iter_chinese_dates(start: int, end: int):
+    """
+    Yield (fixed, ChineseDate) for every fixed date from `start` to `end`
+    inclusive.
+    """
+    fixed = start
+    while fixed <= end:
+        info = chinese_year_info_for(fixed)
+        i = bisect_right(info.month_starts, fixed) - 1
+        while i < len(info.month_starts) and fixed <= end:
+            m = info.month_starts[i]
+            if i + 1 < len(info.month_starts):
+                month_end = info.month_starts[i + 1] - 1
+            else:
+                month_end = info.s2 - 1
+            first = chinese_date_in_year(info, fixed)
+            for day in range(fixed, min(month_end, end) + 1):
+                yield day, first._replace(day=day - m + 1)
+            fixed = month_end + 1
+            i += 1
+
+
+def iter_calendar_records(start: int, end: int):
+    """
+    Yield one dict per day with the Chinese date, season and moon phase.
+    """
+    season = None
+    month = None
+    for fixed, cd in iter_chinese_dates(start, end):
+        if cd.month != month:
+            month = cd.month
+            season = get_chinese_season_by_month(month)
+        gregorian = date.fromordinal(fixed)
+        yield {
+            "date":           gregorian.isoformat(),
+            "cycle":          cd.cycle,
+            "year":           cd.year,
+            "month":          cd.month,
+            "is_leap_month":  cd.is_leap_month,
+            "day":            cd.day,
+            "name":           cd.name,
+            "chinese_season": season,
+            "moon_phase":     moon_phase(datetime.combine(gregorian, time(), tzinfo=timezone.utc)),
+        }
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def export_calendar(start_date: date, end_date: date):
+    """
+    NDJSON lines for every day from `start_date` to `end_date` inclusive.
+    Raises ValueError at once if either year is outside the supported range.
+    """
+    check_supported_year(start_date.year)
+    check_supported_year(end_date.year)
+    start = fixed_from_gregorian(start_date.year, start_date.month, start_date.day)
+    end = fixed_from_gregorian(end_date.year, end_date.month, end_date.day)
+    return iter_ndjson(iter_calendar_records(start, end))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a Chinese calendar range as NDJSON.")
+    parser.add_argument('start', type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument('end', type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument('--output', '-o', help="output file (default: stdout)")
+    args = parser.parse_args()
+    try:
+        lines = export_calendar(args.start, args.end)
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        out.writelines(lines)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
+from bisect import bisect_right
 from collections import namedtuple
+from functools import lru_cache
 import math
 from math import floor
-import mpmath as mp
-mp.mp.dps = 50  # 50 decimal‐digit precision
+import os
+import struct
+
+from calculation.counters import counted
+from calculation.timing import timed
+from calculation.version import ALGORITHM_VERSION
 
 # --- Supporting classes and stubs ---
 class Location:
@@ -77,9 +83,27 @@ def gregorian_new_year(g_year: int) -> int:
     # Simply delegate to your converter at month=1, day=1
     return fixed_from_gregorian(g_year, 1, 1)
 
+def gregorian_from_fixed(date: int):
+    """
+    (year, month, day) of the proleptic Gregorian date for fixed `date`.
+    """
+    year = gregorian_year_from_fixed(date)
+    prior_days = date - gregorian_new_year(year)
+    if date < fixed_from_gregorian(year, 3, 1):
+        correction = 0
+    else:
+        correction = 1 if gregorian_leap_year(year) else 2
+    month = (12 * (prior_days + correction) + 373) // 367
+    day = date - fixed_from_gregorian(year, month, 1) + 1
+    return year, month, day
+
 # Named tuple to represent the Chinese date result
 ChineseDate = namedtuple("ChineseDate", ["cycle", "year", "month", "is_leap_month", "day", "name"])
 
+# Month structure shared by every date between two winter solstices
+ChineseYear = namedtuple("ChineseYear", ["s1", "s2", "m12", "next_m11", "leap_year",
+                                         "month_starts", "leap_index"])
+
 # --- Constants (please define these) ---
 mean_synodic_month = 29.530588861
 mean_tropical_year = 365.242189
@@ -101,46 +125,171 @@ def estimate_prior_solar_longitude(lambda_deg, tee):
     cap_delta = ((solar_longitude(tau) - lambda_deg + 180) % 360) - 180
     return min(tee, tau - rate * cap_delta)
 
+def invert_angular(f, y, lo, hi, tolerance=1e-5, max_iterations=50):
+    """
+    Moment in [lo, hi] at which the angular function `f` (degrees) reaches
+    `y`, for `f` increasing through `y` on the bracket.  Regula falsi with
+    the Illinois modification, falling back to bisection if a step leaves
+    the bracket.
+    """
+    def offset(x):
+        return ((f(x) - y + 180) % 360) - 180
+
+    a, b = lo, hi
+    fa, fb = offset(a), offset(b)
+    if fa >= 0:
+        return a
+    side = 0
+    for _ in range(max_iterations):
+        if b - a <= tolerance:
+            break
+        x = b - fb * (b - a) / (fb - fa)
+        if not a < x < b:
+            x = (a + b) / 2
+        fx = offset(x)
+        if fx < 0:
+            a, fa = x, fx
+            if side == -1:
+                fb /= 2
+            side = -1
+        else:
+            b, fb = x, fx
+            if side == 1:
+                fa /= 2
+            side = 1
+    return (a + b) / 2
+
+def refine_solar_longitude(lambda_deg, tee, lo, hi, tolerance=1e-5):
+    """
+    Moment in [lo, hi] at which the solar longitude reaches `lambda_deg`,
+    starting from the estimate `tee`: one step at the mean solar rate,
+    then secant steps; falls back to `invert_angular` on the bracket if
+    an iterate leaves it.
+    """
+    rate = mean_tropical_year / 360.0
+
+    def offset(x):
+        return ((solar_longitude(x) - lambda_deg + 180) % 360) - 180
+
+    x0 = tee
+    f0 = offset(x0)
+    x1 = x0 - rate * f0
+    for _ in range(8):
+        if abs(x1 - x0) <= tolerance:
+            return x1
+        if not lo <= x1 <= hi:
+            break
+        f1 = offset(x1)
+        if f1 == f0:
+            return x1
+        x0, f0, x1 = x1, f1, x1 - f1 * (x1 - x0) / (f1 - f0)
+    return invert_angular(solar_longitude, lambda_deg, lo, hi, tolerance)
+
+def solar_longitude_after(lambda_deg, tee, tolerance=1e-5):
+    """
+    Moment (UT) of the first time at or after `tee` when the solar
+    longitude reaches `lambda_deg` degrees.
+    """
+    rate = mean_tropical_year / 360.0
+    tau = tee + rate * ((lambda_deg - solar_longitude(tee)) % 360)
+    return refine_solar_longitude(lambda_deg, tau, tee, tau + 5, tolerance)
+
+def solar_longitude_before(lambda_deg, tee, tolerance=1e-5):
+    """
+    Moment (UT) of the last time at or before `tee` when the solar
+    longitude reached `lambda_deg` degrees.
+    """
+    rate = mean_tropical_year / 360.0
+    tau = tee - rate * ((solar_longitude(tee) - lambda_deg) % 360)
+    return refine_solar_longitude(lambda_deg, tau, tau - 5, tee, tolerance)
+
 def midnight_in_china(date):
     return universal_from_standard(date, chinese_location(date))
 
+# Periodic terms of the solar longitude series (Bretagnon & Simon)
+solar_longitude_coefficients = [403406, 195207, 119433, 112392, 3891, 2819, 1721,
+                                660, 350, 334, 314, 268, 242, 234, 158, 132, 129, 114,
+                                99, 93, 86, 78, 72, 68, 64, 46, 38, 37, 32, 29, 28, 27, 27,
+                                25, 24, 21, 20, 18, 17, 14, 13, 13, 12, 10, 10, 10]
+solar_longitude_multipliers = [0.9287892, 35999.1376958, 35999.4089666,
+                               35998.7287385, 71998.20261, 71998.4403, 36000.35726,
+                               71997.4812, 32964.4678, -19.441, 445267.1117, 45036.884,
+                               3.1008, 22518.443, -19.9739, 65928.9345, 9038.0293, 3034.7684,
+                               33718.148, 3034.448, -2280.773, 29929.992, 31556.493, 149.588,
+                               9037.75, 107997.405, -4444.176, 151.771, 67555.316, 31556.08,
+                               -4561.54, 62894.167, 107996.706, 1221.655, 62894.167, 31437.369,
+                               14578.298, -31931.757, 34777.243, 1221.999, 62894.511,
+                               -4442.039, 107997.909, 119.066, 16859.071, -4.578, 26895.292,
+                               -39.127, 12297.536, 90073.778]
+solar_longitude_addends = [270.54861, 340.19128, 63.91854, 331.2622, 317.843, 86.631,
+                           240.052, 310.26, 247.23, 260.87, 297.82, 343.14, 166.79, 81.53,
+                           3.5, 132.75, 182.95, 162.03, 29.8, 266.4, 249.2, 157.6, 257.8,
+                           185.1, 69.9, 8.0, 197.1, 250.4, 65.3, 162.7, 341.5, 291.6,
+                           98.5, 146.7, 110.0, 5.2, 342.6, 230.9, 256.1, 45.3, 242.9,
+                           115.2, 151.8, 285.3, 53.3, 126.6, 205.7, 85.9, 146.1]
+
 # Astronomical solar longitude calculation
-def solar_longitude(tee):
+@counted('solar_longitude')
+def solar_longitude(tee, dps=None):
+    """
+    Solar longitude (degrees) at moment `tee`.  Pass `dps` to evaluate the
+    same series with mpmath at that many decimal digits (see precise.py).
+    """
+    if dps is not None:
+        from calculation import precise
+        return precise.solar_longitude(tee, dps)
     c = julian_centuries(tee)
-    coefficients = [403406, 195207, 119433, 112392, 3891, 2819, 1721,
-                    660, 350, 334, 314, 268, 242, 234, 158, 132, 129, 114,
-                    99, 93, 86, 78, 72, 68, 64, 46, 38, 37, 32, 29, 28, 27, 27,
-                    25, 24, 21, 20, 18, 17, 14, 13, 13, 12, 10, 10, 10]
-    multipliers = [0.9287892, 35999.1376958, 35999.4089666,
-                   35998.7287385, 71998.20261, 71998.4403, 36000.35726,
-                   71997.4812, 32964.4678, -19.441, 445267.1117, 45036.884,
-                   3.1008, 22518.443, -19.9739, 65928.9345, 9038.0293, 3034.7684,
-                   33718.148, 3034.448, -2280.773, 29929.992, 31556.493, 149.588,
-                   9037.75, 107997.405, -4444.176, 151.771, 67555.316, 31556.08,
-                   -4561.54, 62894.167, 107996.706, 1221.655, 62894.167, 31437.369,
-                   14578.298, -31931.757, 34777.243, 1221.999, 62894.511,
-                   -4442.039, 107997.909, 119.066, 16859.071, -4.578, 26895.292,
-                   -39.127, 12297.536, 90073.778]
-    addends = [270.54861, 340.19128, 63.91854, 331.2622, 317.843, 86.631,
-               240.052, 310.26, 247.23, 260.87, 297.82, 343.14, 166.79, 81.53,
-               3.5, 132.75, 182.95, 162.03, 29.8, 266.4, 249.2, 157.6, 257.8,
-               185.1, 69.9, 8.0, 197.1, 250.4, 65.3, 162.7, 341.5, 291.6,
-               98.5, 146.7, 110.0, 5.2, 342.6, 230.9, 256.1, 45.3, 242.9,
-               115.2, 151.8, 285.3, 53.3, 126.6, 205.7, 85.9, 146.1]
     sigma = sum(a * math.sin(math.radians(b + m_mul * c))
-                for a, b, m_mul in zip(coefficients, addends, multipliers))
+                for a, b, m_mul in zip(solar_longitude_coefficients,
+                                       solar_longitude_addends,
+                                       solar_longitude_multipliers))
     lam = (282.7771834 + 36000.76953744 * c
            + 0.000005729577951308232 * sigma)
     lam += aberration(tee) + nutation(tee)
     return lam % 360
 
+# Periodic terms of the lunar longitude series (Meeus)
+lunar_sine_coefficients = [
+    6288774, 1274027, 658314, 213618, -185116, -114332,
+    58793, 57066, 53322, 45758, -40923, -34720, -30383,
+    15327, -12528, 10980, 10675, 10034, 8548, -7888,
+    -6766, -5163, 4987, 4036, 3994, 3861, 3665, -2689,
+    -2602, 2390, -2348, 2236, -2120, -2069, 2048, -1773,
+    -1595, 1215, -1110, -892, -810, 759, -713, -700, 691,
+    596, 549, 537, 520, -487, -399, -381, 351, -340, 330,
+    327, -323, 299, 294
+]
+lunar_args_elongation = [
+    0,2,2,0,0,0,2,2,2,0,1,0,2,0,0,4,0,4,2,2,1,
+    2,2,4,2,0,2,2,2,2,4,0,3,2,4,0,2,2,4,0,4,1,2,0,1,3,4,2,0,1,2
+]
+lunar_args_solar_anomaly = [
+    0,0,0,0,1,0,0,-1,-1,1,0,1,1,0,0,0,0,0,1,1,
+    0,1,-1,0,0,0,1,0,-1,0,-2,1,2,-2,0,0,-1,0,1,
+    -1,2,2,1,-1,0,-1,0,1,0,1,0
+]
+lunar_args_lunar_anomaly = [
+    1,-1,0,2,0,0,-2,1,1,0,-1,0,1,0,1,1,-1,3,-2,
+    -1,0,-1,0,1,2,0,-3,-2,-1,-2,1,0,2,0,2,-1,2,2,-1,-2,1,0,2,1,4,0,-2,0,2,1,-2,-3,2,1,-1,3
+]
+lunar_args_moon_node = [
+    0,0,0,0,2,0,0,0,0,0,0,-2,2,-2,0,0,0,0,0,
+    0,0,0,0,2,0,0,0,0,0,0,-2,2,-2,0,0,0,0,0,0,
+    0,0,-2,0,0,0,0,-2,-2,0,0,0,0
+]
+
 # Solar aberration and nutation stubs
-def lunar_longitude(tee):
+@counted('lunar_longitude')
+def lunar_longitude(tee, dps=None):
     """
     Longitude of the Moon (in degrees) at moment tee.
     Adapted from "Astronomical Algorithms" by Jean Meeus,
     Willmann-Bell (1998), pp. 338–342.
+    Pass `dps` for the mpmath evaluation (see precise.py).
     """
+    if dps is not None:
+        from calculation import precise
+        return precise.lunar_longitude(tee, dps)
     c = julian_centuries(tee)
 
     # Fundamental arguments
@@ -153,44 +302,14 @@ def lunar_longitude(tee):
     # Small polynomial correction E
     cap_E = poly(c, [1, -0.002516, -0.0000074])
 
-    # Periodic-term coefficients from Meeus
-    sine_coeff = [
-        6288774, 1274027, 658314, 213618, -185116, -114332,
-        58793, 57066, 53322, 45758, -40923, -34720, -30383,
-        15327, -12528, 10980, 10675, 10034, 8548, -7888,
-        -6766, -5163, 4987, 4036, 3994, 3861, 3665, -2689,
-        -2602, 2390, -2348, 2236, -2120, -2069, 2048, -1773,
-        -1595, 1215, -1110, -892, -810, 759, -713, -700, 691,
-        596, 549, 537, 520, -487, -399, -381, 351, -340, 330,
-        327, -323, 299, 294
-    ]
-    args_lunar_elongation = [
-        0,2,2,0,0,0,2,2,2,0,1,0,2,0,0,4,0,4,2,2,1,
-        2,2,4,2,0,2,2,2,2,4,0,3,2,4,0,2,2,4,0,4,1,2,0,1,3,4,2,0,1,2
-    ]
-    args_solar_anomaly      = [
-        0,0,0,0,1,0,0,-1,-1,1,0,1,1,0,0,0,0,0,1,1,
-        0,1,-1,0,0,0,1,0,-1,0,-2,1,2,-2,0,0,-1,0,1,
-        -1,2,2,1,-1,0,-1,0,1,0,1,0
-    ]
-    args_lunar_anomaly      = [
-        1,-1,0,2,0,0,-2,1,1,0,-1,0,1,0,1,1,-1,3,-2,
-        -1,0,-1,0,1,2,0,-3,-2,-1,-2,1,0,2,0,2,-1,2,2,-1,-2,1,0,2,1,4,0,-2,0,2,1,-2,-3,2,1,-1,3
-    ]
-    args_moon_node          = [
-        0,0,0,0,2,0,0,0,0,0,0,-2,2,-2,0,0,0,0,0,
-        0,0,0,0,2,0,0,0,0,0,0,-2,2,-2,0,0,0,0,0,0,
-        0,0,-2,0,0,0,0,-2,-2,0,0,0,0
-    ]
-
     # Compute the periodic correction ("sigma" in Lisp)
     correction = 0.0
     for v, w, x, y, z in zip(
-        sine_coeff,
-        args_lunar_elongation,
-        args_solar_anomaly,
-        args_lunar_anomaly,
-        args_moon_node
+        lunar_sine_coefficients,
+        lunar_args_elongation,
+        lunar_args_solar_anomaly,
+        lunar_args_lunar_anomaly,
+        lunar_args_moon_node
     ):
         term = v * (cap_E ** abs(x)) * math.sin(math.radians(
             w * cap_D +
@@ -290,13 +409,11 @@ def nutation(tee):
     return -0.004778 * math.sin(A) + -0.0003667 * math.sin(B)
 
 # Ephemeris correction (ΔT)
-def ephemeris_correction(tee):
+def ephemeris_correction_for_year(year):
     """
-    Dynamical Time minus Universal Time (days) for moment `tee`.
+    Dynamical Time minus Universal Time (days) during Gregorian `year`.
     Adapted from "Astronomical Algorithms" by Jean Meeus (1991) and NASA polynomials.
     """
-    # Gregorian year at this date
-    year = gregorian_year_from_fixed(math.floor(tee))
     # Fixed dates for 1900-01-01 and July 1 of year
     d0 = fixed_from_gregorian(1900, 1, 1)
     d1 = fixed_from_gregorian(year, 7, 1)
@@ -337,6 +454,37 @@ def ephemeris_correction(tee):
                               -0.005050998, 0.0083572073]) / 86400
     return dt
 
+# ΔT only changes with the Gregorian year, so it is tabulated per year over
+# the range conversions actually hit, along with each year's January 1.
+delta_t_first_year = 1600
+delta_t_last_year = 2200
+_delta_t_new_years = [gregorian_new_year(y) for y in range(delta_t_first_year, delta_t_last_year + 1)]
+_delta_t_by_year = [ephemeris_correction_for_year(y) for y in range(delta_t_first_year, delta_t_last_year + 1)]
+_delta_t_end = gregorian_new_year(delta_t_last_year + 1)
+
+# Gregorian years the calendar conversions accept: the span of the ΔT table.
+# Far outside it the astronomy is meaningless and the searches can run for
+# a very long time, so callers taking user input must check first.
+supported_first_year = delta_t_first_year
+supported_last_year = delta_t_last_year
+
+def check_supported_year(g_year):
+    """
+    Raise ValueError unless Gregorian year `g_year` is supported.
+    """
+    if not supported_first_year <= g_year <= supported_last_year:
+        raise ValueError(f"year must be {supported_first_year}..{supported_last_year}")
+
+@counted('ephemeris_correction')
+def ephemeris_correction(tee):
+    """
+    Dynamical Time minus Universal Time (days) for moment `tee`.
+    """
+    date = math.floor(tee)
+    if _delta_t_new_years[0] <= date < _delta_t_end:
+        return _delta_t_by_year[bisect_right(_delta_t_new_years, date) - 1]
+    return ephemeris_correction_for_year(gregorian_year_from_fixed(date))
+
 # New moon stubs
 def lunar_phase(tee):
     """
@@ -346,8 +494,7 @@ def lunar_phase(tee):
     # Angle between lunar and solar longitude
     phi = (lunar_longitude(tee) - solar_longitude(tee)) % 360.0
     # Find nearest new moon index
-    t0 = nth_new_moon(0)
-    n = round((tee - t0) / mean_synodic_month)
+    n = round((tee - new_moon_epoch) / mean_synodic_month)
     # Phase approximation based on time since nth new moon
     phi_prime = 360.0 * (((tee - nth_new_moon(n)) / mean_synodic_month) % 1.0)
     # If the two estimates differ by more than 180°, use 180° to avoid ambiguity
@@ -355,10 +502,15 @@ def lunar_phase(tee):
         return 180.0
     return phi_prime
 
+# Lunations near a conversion are revisited constantly; 4096 entries cover
+# roughly three centuries.  nth_new_moon.cache_info() reports hits/misses.
+@lru_cache(maxsize=4096)
+@counted('nth_new_moon')
 def nth_new_moon(n):
     """
     Astronomical instant (UT) of the n-th new moon since the epoch.
     Adapted from Meeus, Astronomical Algorithms (2005).
+    Memoized by lunation number `n` (an integer).
     """
     # Months since epoch offset for J2000
     n0 = 24724
@@ -442,42 +594,57 @@ def nth_new_moon(n):
     # Convert from dynamical to universal time
     return true_time - ephemeris_correction(true_time)
 
+# Instant of new moon number 0, the reference for lunation estimates
+new_moon_epoch = nth_new_moon(0)
+
+# True new moons stay within about 0.6 days of the mean lunation, so an
+# index estimated from the epoch is off by at most one near the present.
+# ΔT grows quadratically away from it, and the estimate drifts by a few
+# dozen lunations by the year 10000; further out the searches give up
+# rather than step for ever.
+max_lunation_steps = 64
+
+def lunation_index_at_or_after(tee):
+    """
+    Number of the first new moon at or after moment `tee` (UT).
+    """
+    k = math.ceil((tee - new_moon_epoch) / mean_synodic_month)
+    for _ in range(max_lunation_steps):
+        if nth_new_moon(k - 1) >= tee:
+            k -= 1
+        elif nth_new_moon(k) < tee:
+            k += 1
+        else:
+            return k
+    raise ValueError(f"no new moon found near moment {tee}")
+
+def lunation_index_before(tee):
+    """
+    Number of the last new moon before moment `tee` (UT).
+    """
+    k = math.floor((tee - new_moon_epoch) / mean_synodic_month)
+    for _ in range(max_lunation_steps):
+        if nth_new_moon(k) >= tee:
+            k -= 1
+        elif nth_new_moon(k + 1) < tee:
+            k += 1
+        else:
+            return k
+    raise ValueError(f"no new moon found near moment {tee}")
+
+@timed('new_moon')
 def new_moon_at_or_after(tee):
     """
     Astronomical instant of the first new moon at or after `tee` (UT).
     """
-    t0 = nth_new_moon(0)
-    phi = lunar_phase(tee)
-    n = round((tee - t0) / mean_synodic_month - (phi / 360.0))
-    k = n
-    while True:
-        t = nth_new_moon(k)
-        if t >= tee:
-            return t
-        k += 1
+    return nth_new_moon(lunation_index_at_or_after(tee))
 
+@timed('new_moon')
 def new_moon_before(tee):
     """
-    Astronomical instant of the last new moon before `tee` (UT),
-    translated directly from CC-2 fig. 14.46.
+    Astronomical instant of the last new moon before `tee` (UT).
     """
-    # 1) Base epoch new moon
-    t0 = nth_new_moon(0)
-
-    # 2) Phase correction
-    phi = lunar_phase(tee)
-
-    # 3) Estimate month index
-    p = (tee - t0) / mean_synodic_month - (phi / 360.0)
-    n = round(p)
-
-    # Seed at n-1, then step k *up* until nth_new_moon(k) < tee
-    k = n - 1
-    while True:
-        k += 1
-        t = nth_new_moon(k)
-        if t < tee:
-            return t
+    return nth_new_moon(lunation_index_before(tee))
 
 # Time conversions
 def standard_from_universal(tee, location):
@@ -501,6 +668,7 @@ def chinese_location(tee):
     return Location(offset)
 
 # Major solar term stub
+@timed('solar_terms')
 def current_major_solar_term(date):
     """
     Last Chinese major solar term (zhongqi) before fixed `date`.
@@ -517,25 +685,45 @@ def current_major_solar_term(date):
 # Dynamical/ephemeris time
 def dynamical_from_universal(tee_rom_u):
     return tee_rom_u + ephemeris_correction(tee_rom_u)
-    return dt
 
 # Helper arithmetic
 def amod(x, y):
     return ((x - 1) % y) + 1
 
 # Chinese calendar conversion
-def chinese_winter_solstice_on_or_before(date):
-    approx = estimate_prior_solar_longitude(
-        winter_solar_longitude, midnight_in_china(date + 1)
-    )
-    test = midnight_in_china(date + 1)
-    day = floor(approx) - 1
-    test1 = solar_longitude(midnight_in_china(day + 1))
-    while solar_longitude(midnight_in_china(day + 1)) < winter_solar_longitude:
-        test2 = solar_longitude(midnight_in_china(day + 1))
-        day += 1
+# Day resolution is all the calendar needs: crossings are located to
+# about 1.5 minutes and midnights re-checked only when that close to one.
+_day_tolerance = 1e-3
+
+def chinese_day_of_solar_longitude(lambda_deg, tee):
+    """
+    Fixed date in China whose end (midnight) is the first to see the solar
+    longitude at or past `lambda_deg`, given the crossing moment `tee`.
+    """
+    local = standard_from_universal(tee, chinese_location(tee))
+    day = math.ceil(local) - 1
+    if local - floor(local) < _day_tolerance or math.ceil(local) - local < _day_tolerance:
+        def reached(d):
+            return ((solar_longitude(midnight_in_china(d + 1)) - lambda_deg + 180) % 360) - 180 >= 0
+        while not reached(day):
+            day += 1
+        while reached(day - 1):
+            day -= 1
     return day
 
+def chinese_solar_longitude_on_or_after(lambda_deg, date):
+    """
+    First fixed date on or after `date` during which (in China) the solar
+    longitude reaches `lambda_deg`.
+    """
+    tee = solar_longitude_after(lambda_deg, midnight_in_china(date), _day_tolerance)
+    return max(date, chinese_day_of_solar_longitude(lambda_deg, tee))
+
+@timed('solstice')
+def chinese_winter_solstice_on_or_before(date):
+    tee = solar_longitude_before(winter_solar_longitude, midnight_in_china(date + 1), _day_tolerance)
+    return chinese_day_of_solar_longitude(winter_solar_longitude, tee)
+
 def chinese_new_moon_on_or_after(date):
     tee = new_moon_at_or_after(midnight_in_china(date))
     return floor(standard_from_universal(tee, chinese_location(tee)))
@@ -544,43 +732,177 @@ def chinese_new_moon_before(date):
     tee = new_moon_before(midnight_in_china(date))
     return floor(standard_from_universal(tee, chinese_location(tee)))
 
-def chinese_prior_leap_month(m12, m):
-    if m < m12:
-        return False
-    if chinese_no_major_solar_term(m):
-        return True
-    return chinese_prior_leap_month(m12, chinese_new_moon_before(m))
-
-def chinese_no_major_solar_term(date):
-    first_term = current_major_solar_term(date)
-    next_date = chinese_new_moon_on_or_after(date + 1)
-    return first_term == current_major_solar_term(next_date)
+# Celestial stems and terrestrial branches, in cycle order
+sexagenary_stems    = ("Jia", "Yi", "Bing", "Ding", "Wu", "Ji", "Geng", "Xin", "Ren", "Gui")
+sexagenary_branches = ("Zi", "Chou","Yin","Mao","Chen","Si","Wu","Wei","Shen","You","Xu","Hai")
 
 def sexagenary_name(year_in_cycle: int) -> str:
-    stems    = ["Jia", "Yi", "Bing", "Ding", "Wu", "Ji", "Geng", "Xin", "Ren", "Gui"]
-    branches = ["Zi", "Chou","Yin","Mao","Chen","Si","Wu","Wei","Shen","You","Xu","Hai"]
-    s = stems   [(year_in_cycle - 1) % 10]
-    b = branches[(year_in_cycle - 1) % 12]
+    s = sexagenary_stems   [(year_in_cycle - 1) % 10]
+    b = sexagenary_branches[(year_in_cycle - 1) % 12]
     return f"{s}-{b}"
 
-def chinese_from_fixed(date):
-    s1 = chinese_winter_solstice_on_or_before(date)
+@timed('calendar')
+def computed_chinese_year(g_year):
+    """
+    Month structure of the Chinese solar year beginning at the winter
+    solstice in December of Gregorian year `g_year`, computed from the
+    astronomy functions.
+
+    `month_starts` runs from the month-11 new moon on or before the
+    solstice up to `next_m11`; `leap_index` is the position of the leap
+    month in it (None if there is none).
+    """
+    s1 = chinese_winter_solstice_on_or_before(fixed_from_gregorian(g_year, 12, 31))
     s2 = chinese_winter_solstice_on_or_before(s1 + 370)
     m12 = chinese_new_moon_on_or_after(s1 + 1)
     next_m11 = chinese_new_moon_before(s2 + 1)
-    m = chinese_new_moon_before(date + 1)
     leap_year = round((next_m11 - m12) / mean_synodic_month) == 12
+
+    month_starts = [chinese_new_moon_before(s1 + 1)]
+    while month_starts[-1] < next_m11:
+        month_starts.append(chinese_new_moon_on_or_after(month_starts[-1] + 1))
+
+    # In a leap year the first month from m12 on without a major solar term
+    # is the leap month; the next month start closes each month, so each
+    # major term is evaluated once and the scan stops at the leap month.
+    leap_index = None
+    if leap_year:
+        month_starts.append(chinese_new_moon_on_or_after(next_m11 + 1))
+        term = current_major_solar_term(m12)
+        for i in range(1, len(month_starts) - 1):
+            next_term = current_major_solar_term(month_starts[i + 1])
+            if term == next_term:
+                leap_index = i
+                break
+            term = next_term
+        month_starts.pop()
+    return ChineseYear(s1, s2, m12, next_m11, leap_year, tuple(month_starts), leap_index)
+
+def computed_solar_terms(s1):
+    """
+    Fixed dates (in China) of the 24 solar terms of the solar year starting
+    at winter solstice `s1`; term k is reached at 270 + 15k degrees.
+    """
+    dates = [s1]
+    for k in range(1, 24):
+        lam = (winter_solar_longitude + 15 * k) % 360
+        dates.append(chinese_solar_longitude_on_or_after(lam, dates[-1] + 13))
+    return tuple(dates)
+
+# --- Precomputed table (see calculation/build_calendar_table.py) ---
+CALENDAR_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   'data', 'chinese_calendar_1900_2100.bin')
+CALENDAR_TABLE_MAGIC = b'CCAL'
+CALENDAR_TABLE_VERSION = 2
+# magic, format version, ALGORITHM_VERSION it was built with, first solar
+# year, number of years
+CALENDAR_TABLE_HEADER = struct.Struct('<4sH16shH')
+# month-11 start, then offsets from it: s1, s2, month count, leap index
+# (-1 if none), 14 month starts and 24 solar-term dates
+CALENDAR_TABLE_RECORD = struct.Struct('<iBHBb14H24H')
+CALENDAR_TABLE_MONTHS = 14
+
+_calendar_table = None
+
+def pack_calendar_year(info, terms):
+    """
+    Encode one solar year for the calendar table.
+    """
+    base = info.month_starts[0]
+    months = [m - base for m in info.month_starts]
+    months += [0] * (CALENDAR_TABLE_MONTHS - len(months))
+    leap = -1 if info.leap_index is None else info.leap_index
+    return CALENDAR_TABLE_RECORD.pack(base, info.s1 - base, info.s2 - base,
+                                      len(info.month_starts), leap,
+                                      *months, *(t - base for t in terms))
+
+def unpack_calendar_year(record):
+    """
+    Decode one table record into (ChineseYear, solar-term dates).
+    """
+    base, s1, s2, count, leap, *rest = CALENDAR_TABLE_RECORD.unpack(record)
+    month_starts = tuple(base + m for m in rest[:count])
+    terms = tuple(base + t for t in rest[CALENDAR_TABLE_MONTHS:])
+    leap_index = leap if leap >= 0 else None
+    info = ChineseYear(base + s1, base + s2, month_starts[1], month_starts[-1],
+                       leap_index is not None, month_starts, leap_index)
+    return info, terms
+
+def load_calendar_table(path=CALENDAR_TABLE_PATH):
+    """
+    Read the precomputed calendar table into {g_year: (ChineseYear, terms)}.
+    A missing or incompatible file, or one built by another ALGORITHM_VERSION,
+    gives an empty table, so every year is computed instead.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, built_with, first_year, count = CALENDAR_TABLE_HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return {}
+    if magic != CALENDAR_TABLE_MAGIC or version != CALENDAR_TABLE_VERSION:
+        return {}
+    if built_with.rstrip(b'\0').decode('ascii', 'replace') != ALGORITHM_VERSION:
+        return {}
+    size = CALENDAR_TABLE_RECORD.size
+    offset = CALENDAR_TABLE_HEADER.size
+    return {
+        first_year + i: unpack_calendar_year(data[offset + i * size: offset + (i + 1) * size])
+        for i in range(count)
+    }
+
+def calendar_table():
+    global _calendar_table
+    if _calendar_table is None:
+        _calendar_table = load_calendar_table()
+    return _calendar_table
+
+@lru_cache(maxsize=256)
+def chinese_year_info(g_year):
+    """
+    Month structure of the Chinese solar year beginning at the winter
+    solstice of Gregorian year `g_year`: from the table when covered,
+    computed otherwise.
+    """
+    tabled = calendar_table().get(g_year)
+    if tabled is not None:
+        return tabled[0]
+    return computed_chinese_year(g_year)
+
+@lru_cache(maxsize=256)
+def chinese_solar_terms(g_year):
+    """
+    Fixed dates of the 24 solar terms from the winter solstice of
+    Gregorian year `g_year`.
+    """
+    tabled = calendar_table().get(g_year)
+    if tabled is not None:
+        return tabled[1]
+    return computed_solar_terms(chinese_year_info(g_year).s1)
+
+def chinese_year_info_for(date):
+    """
+    Month structure of the Chinese solar year containing fixed `date`.
+    """
+    g_year = gregorian_year_from_fixed(date)
+    info = chinese_year_info(g_year)
+    if date < info.s1:
+        info = chinese_year_info(g_year - 1)
+    return info
+
+def chinese_date_in_year(info, date):
+    """
+    Chinese date of fixed `date`, which must fall within the solar year `info`.
+    """
+    i = bisect_right(info.month_starts, date) - 1
+    m = info.month_starts[i]
+    leap_month = i == info.leap_index
+    prior_leap = info.leap_index is not None and info.leap_index <= i
     month = amod(
-        round((m - m12) / mean_synodic_month)
-        - (1 if (leap_year and chinese_prior_leap_month(m12, m)) else 0),
+        round((m - info.m12) / mean_synodic_month)
+        - (1 if (info.leap_year and prior_leap) else 0),
         12
     )
-    leap_month = (
-        leap_year
-        and chinese_no_major_solar_term(m)
-        and not chinese_prior_leap_month(m12, m)
-        and (m12 == chinese_new_moon_before(m))
-    )
 
     elapsed_years = floor(1.5 - (month / 12) + (date - chinese_epoch) / mean_tropical_year)
     cycle = (elapsed_years - 1) // 60 + 1
@@ -589,6 +911,81 @@ def chinese_from_fixed(date):
     name = sexagenary_name(year)
     return ChineseDate(cycle, year, month, leap_month, day, name)
 
+@timed('calendar')
+def chinese_from_fixed(date):
+    return chinese_date_in_year(chinese_year_info_for(date), date)
+
+@timed('calendar')
+def chinese_from_fixed_many(dates):
+    """
+    Chinese dates for a sequence of fixed dates, returned in input order.
+    Dates are visited in sorted order so each solar year's structure is
+    looked up once, however many dates fall in it.
+    """
+    dates = list(dates)
+    results = [None] * len(dates)
+    info = None
+    for i in sorted(range(len(dates)), key=dates.__getitem__):
+        date = dates[i]
+        if info is None or not info.s1 <= date < info.s2:
+            info = chinese_year_info_for(date)
+        results[i] = chinese_date_in_year(info, date)
+    return results
+
+def chinese_cycle_year(g_year):
+    """
+    (cycle, year) of the Chinese year whose new year falls in Gregorian
+    year `g_year`.
+    """
+    elapsed_years = g_year - gregorian_year_from_fixed(chinese_epoch) + 1
+    return (elapsed_years - 1) // 60 + 1, amod(elapsed_years, 60)
+
+def gregorian_year_of_chinese(cycle, year):
+    """
+    Gregorian year in which `year` of `cycle` begins; the inverse of
+    `chinese_cycle_year`.
+    """
+    return gregorian_year_from_fixed(chinese_epoch) + (cycle - 1) * 60 + year - 1
+
+@lru_cache(maxsize=256)
+def chinese_year_months(cycle, year):
+    """
+    First and next-month fixed dates of every month of Chinese `year` in
+    `cycle`, keyed by (month, is_leap_month).
+    """
+    g_year = gregorian_year_of_chinese(cycle, year)
+    # The year runs from its new year in g_year into the solar year after
+    infos = (chinese_year_info(g_year - 1), chinese_year_info(g_year))
+    starts = sorted(set(infos[0].month_starts) | set(infos[1].month_starts))
+    months = {}
+    for start, next_start in zip(starts, starts[1:]):
+        if start < infos[0].s1:
+            continue
+        info = infos[0] if start < infos[0].s2 else infos[1]
+        cd = chinese_date_in_year(info, start)
+        if cd.cycle == cycle and cd.year == year:
+            months[(cd.month, cd.is_leap_month)] = (start, next_start)
+    return months
+
+@timed('calendar')
+def fixed_from_chinese(cycle, year, month, leap, day):
+    """
+    Fixed date of Chinese date `day` of `month` (the leap month when `leap`)
+    in `year` of `cycle`.  Raises ValueError for dates that do not exist
+    and for years outside the supported range.
+    """
+    if not 1 <= year <= 60:
+        raise ValueError("year must be 1..60")
+    check_supported_year(gregorian_year_of_chinese(cycle, year))
+    bounds = chinese_year_months(cycle, year).get((month, bool(leap)))
+    if bounds is None:
+        kind = "leap month" if leap else "month"
+        raise ValueError(f"no {kind} {month} in year {year} of cycle {cycle}")
+    start, next_start = bounds
+    if not 1 <= day <= next_start - start:
+        raise ValueError(f"day must be 1..{next_start - start}")
+    return start + day - 1
+
 
 def main():
     """
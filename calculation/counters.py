@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# counters.py
+#
+# Evaluation counts of the astronomical series, so we can see how many
+# evaluations one conversion really costs.  Functions are tagged with
+# @counted; `evaluations` holds the running count per name for this process.
+#
+# Enabled with CALCULATION_METRICS=1 in the environment.  When disabled,
+# @counted returns the function unchanged, so counting costs nothing.
+
+import os
+import threading
+from functools import wraps
+
+enabled = os.getenv('CALCULATION_METRICS', '').lower() in ('1', 'true', 'yes')
+
+evaluations = {}
+_lock = threading.Lock()
+
+
+def counted(name):
+    """
+    Decorator counting calls of a function under `name`.
+    """
+    def decorator(func):
+        if not enabled:
+            return func
+        evaluations.setdefault(name, 0)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _lock:
+                evaluations[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(evaluations)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# gregorian_array.py
+#
+# NumPy versions of the Gregorian calendar arithmetic in chinese_calendar,
+# for converting many dates at once (range pipelines, table building).
+# Every function takes integer arrays (or scalars, broadcast together) and
+# agrees exactly with its scalar counterpart.
+
+import numpy as np
+
+from calculation.chinese_calendar import gregorian_epoch
+
+
+def gregorian_leap_year_array(years):
+    years = np.asarray(years, dtype=np.int64)
+    return ((years % 4 == 0) & (years % 100 != 0)) | (years % 400 == 0)
+
+
+def fixed_from_gregorian_array(years, months, days):
+    """
+    Fixed dates of the proleptic Gregorian dates `years`-`months`-`days`.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    y = years - 1
+    fixed = 365 * y + y // 4 - y // 100 + y // 400 + (367 * months - 362) // 12
+    fixed -= np.where(months > 2, np.where(gregorian_leap_year_array(years), 1, 2), 0)
+    return fixed + days + (gregorian_epoch - 1)
+
+
+def gregorian_new_year_array(years):
+    """
+    Fixed dates of January 1 in each of `years`.
+    """
+    return fixed_from_gregorian_array(years, 1, 1)
+
+
+def gregorian_year_from_fixed_array(dates):
+    """
+    Gregorian year of each fixed date in `dates`.
+    """
+    d0 = np.asarray(dates, dtype=np.int64) - gregorian_epoch
+    n400, d1 = np.divmod(d0, 146097)
+    n100, d2 = np.divmod(d1, 36524)
+    n4, d3 = np.divmod(d2, 1461)
+    n1 = d3 // 365
+    year = 400 * n400 + 100 * n100 + 4 * n4 + n1
+    return np.where((n100 == 4) | (n1 == 4), year, year + 1)
+
+
+def gregorian_from_fixed_array(dates):
+    """
+    (years, months, days) arrays of the Gregorian dates of fixed `dates`.
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    years = gregorian_year_from_fixed_array(dates)
+    prior_days = dates - gregorian_new_year_array(years)
+    correction = np.where(dates < fixed_from_gregorian_array(years, 3, 1), 0,
+                          np.where(gregorian_leap_year_array(years), 1, 2))
+    months = (12 * (prior_days + correction) + 373) // 367
+    days = dates - fixed_from_gregorian_array(years, months, 1) + 1
+    return years, months, days
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# moon_events.py
+#
+# Exact instants of the principal moon phases.  New moons come from the
+# nth_new_moon series used by the calendar; first quarter, full moon and last
+# quarter from the companion series of Meeus, Astronomical Algorithms (1998),
+# ch. 49.  Each event is one closed-form evaluation, no sampling or search.
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from math import cos, floor, radians, sin
+
+from calculation.chinese_calendar import (
+    ephemeris_correction, fixed_from_gregorian, j2000, lunation_index_at_or_after,
+    lunation_index_before, mean_synodic_month, nth_new_moon, poly,
+)
+from calculation.timing import timed
+
+PRINCIPAL_PHASES = ("New Moon", "First Quarter", "Full Moon", "Last Quarter")
+
+# Offset between Julian day numbers and fixed moments
+JD_EPOCH = -1721424.5
+
+# Lunation numbers count from the epoch of nth_new_moon; Meeus' k from 2000
+_K_OFFSET = 24724
+
+# Periodic terms: (coefficient, power of E, multiples of M, M', F, Ω)
+_FULL_MOON_TERMS = (
+    (-0.40614, 0, 0, 1, 0, 0), (0.17302, 1, 1, 0, 0, 0), (0.01614, 0, 0, 2, 0, 0),
+    (0.01043, 0, 0, 0, 2, 0), (0.00734, 1, -1, 1, 0, 0), (-0.00515, 1, 1, 1, 0, 0),
+    (0.00209, 2, 2, 0, 0, 0), (-0.00111, 0, 0, 1, -2, 0), (-0.00057, 0, 0, 1, 2, 0),
+    (0.00056, 1, 1, 2, 0, 0), (-0.00042, 0, 0, 3, 0, 0), (0.00042, 1, 1, 0, 2, 0),
+    (0.00038, 1, 1, 0, -2, 0), (-0.00024, 1, -1, 2, 0, 0), (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 2, 1, 0, 0), (0.00004, 0, 0, 2, -2, 0), (0.00004, 0, 3, 0, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0), (0.00003, 0, 0, 2, 2, 0), (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, -1, 1, 2, 0), (-0.00002, 0, -1, 1, -2, 0), (-0.00002, 0, 1, 3, 0, 0),
+    (0.00002, 0, 0, 4, 0, 0),
+)
+
+_QUARTER_TERMS = (
+    (-0.62801, 0, 0, 1, 0, 0), (0.17172, 1, 1, 0, 0, 0), (-0.01183, 1, 1, 1, 0, 0),
+    (0.00862, 0, 0, 2, 0, 0), (0.00804, 0, 0, 0, 2, 0), (0.00454, 1, -1, 1, 0, 0),
+    (0.00204, 2, 2, 0, 0, 0), (-0.00180, 0, 0, 1, -2, 0), (-0.00070, 0, 0, 1, 2, 0),
+    (-0.00040, 0, 0, 3, 0, 0), (-0.00034, 1, -1, 2, 0, 0), (0.00032, 1, 1, 0, 2, 0),
+    (0.00032, 1, 1, 0, -2, 0), (-0.00028, 2, 2, 1, 0, 0), (0.00027, 1, 1, 2, 0, 0),
+    (-0.00017, 0, 0, 0, 0, 1), (-0.00005, 0, -1, 1, -2, 0), (0.00004, 0, 0, 2, 2, 0),
+    (-0.00004, 0, 1, 1, 2, 0), (0.00004, 0, -2, 1, 0, 0), (0.00003, 0, 1, 1, -2, 0),
+    (0.00003, 0, 3, 0, 0, 0), (0.00002, 0, 0, 2, -2, 0), (0.00002, 0, -1, 1, 2, 0),
+    (-0.00002, 0, 1, 3, 0, 0),
+)
+
+# Planetary arguments common to all phases: (constant, rate per lunation, coefficient)
+_PLANETARY_TERMS = (
+    (251.88, 0.016321, 0.000165), (251.83, 26.651886, 0.000164),
+    (349.42, 36.412478, 0.000126), (84.66, 18.206239, 0.000110),
+    (141.74, 53.303771, 0.000062), (207.14, 2.453732, 0.000060),
+    (154.84, 7.306860, 0.000056), (34.52, 27.261239, 0.000047),
+    (207.19, 0.121824, 0.000042), (291.34, 1.844379, 0.000040),
+    (161.72, 24.198154, 0.000037), (239.56, 25.513099, 0.000035),
+    (331.55, 3.592518, 0.000023),
+)
+
+
+def nth_moon_phase(n, quarter):
+    """
+    Instant (UT) of principal phase `quarter` (0 = new moon, 1 = first
+    quarter, 2 = full moon, 3 = last quarter) of lunation `n`.
+    """
+    if quarter == 0:
+        return nth_new_moon(n)
+
+    k = n - _K_OFFSET + quarter / 4
+    c = k / 1236.85
+    approx = j2000 + poly(c, [5.09766, mean_synodic_month * 1236.85,
+                              0.00015437, -0.000000150, 0.00000000073])
+    cap_E = poly(c, [1, -0.002516, -0.0000074])
+    sol_anom = radians(poly(c, [2.5534, 29.10535670 * 1236.85, -0.0000014, -0.00000011]))
+    lun_anom = radians(poly(c, [201.5643, 385.81693528 * 1236.85, 0.0107582,
+                                0.00001238, -0.000000058]))
+    moon_arg = radians(poly(c, [160.7108, 390.67050284 * 1236.85, -0.0016118,
+                                -0.00000227, 0.000000011]))
+    cap_omega = radians(poly(c, [124.7746, -1.56375588 * 1236.85, 0.0020672, 0.00000215]))
+
+    terms = _FULL_MOON_TERMS if quarter == 2 else _QUARTER_TERMS
+    correction = sum(v * cap_E ** e * sin(x * sol_anom + y * lun_anom + z * moon_arg + w * cap_omega)
+                     for v, e, x, y, z, w in terms)
+    if quarter != 2:
+        cap_W = (0.00306 - 0.00038 * cap_E * cos(sol_anom) + 0.00026 * cos(lun_anom)
+                 - 0.00002 * cos(lun_anom - sol_anom) + 0.00002 * cos(lun_anom + sol_anom)
+                 + 0.00002 * cos(2 * moon_arg))
+        correction += cap_W if quarter == 1 else -cap_W
+
+    extra = 0.000325 * sin(radians(poly(c, [299.77, 132.8475848, -0.009173])))
+    additional = sum(coef * sin(radians(const + rate * k))
+                     for const, rate, coef in _PLANETARY_TERMS)
+    true_time = approx + correction + extra + additional
+    return true_time - ephemeris_correction(true_time)
+
+
+@lru_cache(maxsize=1024)
+def lunation_phases(n):
+    """
+    Instants (UT) of the four principal phases of lunation `n`, starting
+    with its new moon.
+    """
+    return tuple(nth_moon_phase(n, quarter) for quarter in range(4))
+
+
+@timed('moon_phase')
+def moon_events(start, end):
+    """
+    (name, moment) of every principal phase at moments in [start, end) (UT),
+    in order.
+    """
+    events = []
+    for n in range(lunation_index_before(start), lunation_index_at_or_after(end)):
+        events.extend((name, tee) for name, tee in zip(PRINCIPAL_PHASES, lunation_phases(n))
+                      if start <= tee < end)
+    return events
+
+
+def moment_to_datetime(tee):
+    """
+    Naive UTC datetime of fixed moment `tee`.
+    """
+    day = floor(tee)
+    return datetime.fromordinal(day) + timedelta(days=tee - day)
+
+
+def moon_events_for_month(year: int, month: int) -> list:
+    """
+    Principal phases in Gregorian `month` of `year` (UTC), as dicts with the
+    phase name, ISO instant and Julian day.
+    """
+    start = fixed_from_gregorian(year, month, 1)
+    end = fixed_from_gregorian(year + (month == 12), month % 12 + 1, 1)
+    return [
+        {
+            "phase_name": name,
+            "moment":     moment_to_datetime(tee).isoformat(timespec='seconds') + "Z",
+            "julian_day": tee - JD_EPOCH,
+        }
+        for name, tee in moon_events(start, end)
+    ]
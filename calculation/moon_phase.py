@@ -9,9 +9,23 @@ import math
 import json
 from datetime import datetime, timezone
 
+from calculation.timing import timed
+
 # mean synodic month (days)
 _SYNODIC_MONTH = 29.530588861
 
+# Meeus periodic terms for the lunar longitude: (D, M, M', F, coefficient)
+_TERMS = (
+    (0,0,1,0,6288774), (2,0,-1,0,1274027), (2,0,0,0,658314),
+    (0,0,2,0,213618), (0,1,0,0,-185116),(0,0,0,2,-114332),
+    (2,0,-2,0,58793),(2,-1,-1,0,57066),(2,0,1,0,53322),
+    (2,-1,0,0,45758),(0,1,-1,0,-40923),(1,0,0,0,-34720),
+    (0,1,1,0,-30383),(2,0,0,-2,15327),(0,0,1,2,-12528),
+    (0,0,1,-2,10980),(4,0,-1,0,10675),(0,0,3,0,10034),
+    (4,0,-2,0,8548),(2,1,-1,0,-7888),(2,1,0,0,-6766),
+    (1,0,-1,0,-5163),(1,1,0,0,4987),(2,-1,1,0,4036),
+)
+
 def _julian_day(dt: datetime) -> float:
     """
     Convert a UTC-aware (or naive UTC) datetime to Julian Day (JD).
@@ -60,6 +74,7 @@ def _phase_name(illum: float) -> str:
         return "Last Quarter"
     return "Waning Crescent"
 
+@timed('moon_phase')
 def moon_phase(dt: datetime) -> dict:
     """
     Given a datetime (UTC or naive=UTC), return:
@@ -86,19 +101,8 @@ def moon_phase(dt: datetime) -> dict:
     Mp = 134.9634114 + 477198.8676313*T + 0.0089970*T**2 + T**3/69699  - T**4/14712000
     F  =  93.2720993 + 483202.0175273*T - 0.0034029*T**2 - T**3/3526000 + T**4/863310000
 
-    TERMS = (
-        (0,0,1,0,6288774), (2,0,-1,0,1274027), (2,0,0,0,658314),
-        (0,0,2,0,213618), (0,1,0,0,-185116),(0,0,0,2,-114332),
-        (2,0,-2,0,58793),(2,-1,-1,0,57066),(2,0,1,0,53322),
-        (2,-1,0,0,45758),(0,1,-1,0,-40923),(1,0,0,0,-34720),
-        (0,1,1,0,-30383),(2,0,0,-2,15327),(0,0,1,2,-12528),
-        (0,0,1,-2,10980),(4,0,-1,0,10675),(0,0,3,0,10034),
-        (4,0,-2,0,8548),(2,1,-1,0,-7888),(2,1,0,0,-6766),
-        (1,0,-1,0,-5163),(1,1,0,0,4987),(2,-1,1,0,4036),
-    )
-
     sigma_l = sum(c * math.sin(rad(d*D + m*M + mp*Mp + f*F))
-                  for d,m,mp,f,c in TERMS)
+                  for d,m,mp,f,c in _TERMS)
     # extra Meeus terms:
     sigma_l += 3958*math.sin(rad(F + lam_sun - 180))
     sigma_l += 1962*math.sin(rad(L0 - lam_sun))
@@ -116,6 +120,64 @@ def moon_phase(dt: datetime) -> dict:
         "phase_name":   _phase_name(illum),
     }
 
+@timed('moon_phase')
+def moon_phase_many(julian_days=None, start=None, stop=None, step=1.0) -> dict:
+    """
+    Vectorized moon_phase over an array of Julian days, or over
+    start, start + step, ... up to (not including) stop; start and stop
+    may be Julian days or datetimes.  Returns the same keys as moon_phase,
+    each an array with one entry per moment.
+    """
+    import numpy as np
+
+    if julian_days is None:
+        if isinstance(start, datetime):
+            start = _julian_day(start)
+        if isinstance(stop, datetime):
+            stop = _julian_day(stop)
+        julian_days = np.arange(start, stop, step, dtype=float)
+    jd = np.asarray(julian_days, dtype=float)
+    T = (jd - 2451545.0) / 36525.0
+
+    L0 = 280.46646 + T*(36000.76983 + 0.0003032*T)
+    M  = 357.52911 + T*(35999.05029 - 0.0001537*T)
+    C  = ((1.914602 - T*(0.004817 + 0.000014*T))*np.sin(np.radians(M))
+          + (0.019993 - 0.000101*T)*np.sin(np.radians(2*M))
+          + 0.000289*np.sin(np.radians(3*M)))
+    lam_sun = (L0 + C) % 360
+
+    Lp = 218.3164591 + 481267.88134236*T - 0.0013268*T**2 + T**3/538841 - T**4/65194000
+    D  = 297.8502042 + 445267.1115168*T - 0.0016300*T**2 + T**3/545868 - T**4/113065000
+    Mp = 134.9634114 + 477198.8676313*T + 0.0089970*T**2 + T**3/69699  - T**4/14712000
+    F  =  93.2720993 + 483202.0175273*T - 0.0034029*T**2 - T**3/3526000 + T**4/863310000
+
+    terms = np.array(_TERMS, dtype=float)
+    args = np.stack([D, M, Mp, F], axis=-1) @ terms[:, :4].T
+    sigma_l = np.sin(np.radians(args)) @ terms[:, 4]
+    sigma_l += 3958*np.sin(np.radians(F + lam_sun - 180))
+    sigma_l += 1962*np.sin(np.radians(L0 - lam_sun))
+
+    lam_moon = (Lp + sigma_l/1_000_000.0) % 360
+
+    delta_l = np.radians((lam_moon - lam_sun) % 360)
+    age     = delta_l / (2*np.pi) * _SYNODIC_MONTH
+    illum   = (1 - np.cos(delta_l)) / 2
+
+    # Same thresholds, in the same order, as _phase_name
+    tol = 0.13
+    phase_name = np.select(
+        [illum <= tol, illum < 0.5 - tol, np.abs(illum - 0.5) <= tol, illum < 1.0 - tol],
+        ["New Moon", "Waxing Crescent", "First Quarter", "Waxing Gibbous"],
+        default="Full Moon",
+    )
+
+    return {
+        "julian_day":   jd,
+        "age_days":     age,
+        "illumination": illum,
+        "phase_name":   phase_name,
+    }
+
 if __name__ == "__main__":
     raw = input("Enter UTC date and time (YYYY MM DD [HH MM SS], time optional): ").split()
     try:
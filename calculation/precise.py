@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# precise.py
+#
+# High-precision (mpmath) evaluation of the solar and lunar longitude series
+# in chinese_calendar, for verification runs.  mpmath is optional and only
+# imported on first use, so the calendar itself stays standard-library only:
+#
+#     solar_longitude(tee, dps=50)   # from chinese_calendar, returns an mpf
+
+from calculation import chinese_calendar as cc
+
+_mpmath = None
+
+
+def _mp():
+    global _mpmath
+    if _mpmath is None:
+        try:
+            import mpmath
+        except ImportError as e:
+            raise ImportError("high-precision mode needs mpmath: pip install mpmath") from e
+        _mpmath = mpmath
+    return _mpmath
+
+
+def _mpf(x):
+    # Go through repr so decimal constants keep their written value
+    return _mp().mpf(repr(x))
+
+
+def _poly(x, coeffs):
+    return sum(_mpf(coef) * x ** i for i, coef in enumerate(coeffs))
+
+
+def _sin_deg(x):
+    mpmath = _mp()
+    return mpmath.sin(mpmath.radians(x))
+
+
+def _julian_centuries(tee):
+    tee = _mpf(tee)
+    return (tee + _mpf(cc.ephemeris_correction(float(tee))) - _mpf(cc.j2000)) / 36525
+
+
+def _aberration(c):
+    mpmath = _mp()
+    return _mpf(-0.0000974) * mpmath.cos(mpmath.radians(_mpf(177.63) + _mpf(35999.01848) * c + _mpf(0.005575)))
+
+
+def _nutation(c):
+    A = _mpf(124.90) + _mpf(-1934.134) * c + _mpf(0.002063) * c * c
+    B = _mpf(201.11) + _mpf(72001.5377) * c + _mpf(0.00057) * c * c
+    return _mpf(-0.004778) * _sin_deg(A) + _mpf(-0.0003667) * _sin_deg(B)
+
+
+def solar_longitude(tee, dps=50):
+    """
+    Solar longitude (degrees, mpf) at moment `tee`, evaluated with `dps`
+    decimal digits.
+    """
+    with _mp().workdps(dps):
+        c = _julian_centuries(tee)
+        sigma = sum(_mpf(a) * _sin_deg(_mpf(b) + _mpf(m_mul) * c)
+                    for a, b, m_mul in zip(cc.solar_longitude_coefficients,
+                                           cc.solar_longitude_addends,
+                                           cc.solar_longitude_multipliers))
+        lam = (_mpf(282.7771834) + _mpf(36000.76953744) * c
+               + _mpf(0.000005729577951308232) * sigma)
+        lam += _aberration(c) + _nutation(c)
+        return +(lam % 360)
+
+
+def lunar_longitude(tee, dps=50):
+    """
+    Lunar longitude (degrees, mpf) at moment `tee`, evaluated with `dps`
+    decimal digits.
+    """
+    with _mp().workdps(dps):
+        c = _julian_centuries(tee)
+
+        cap_L_prime = _poly(c, [218.3164477, 481267.88123421, -0.0015786, 1.0/538841.0, -1.0/65194000.0]) % 360
+        cap_D       = _poly(c, [297.8501921, 445267.1114034, -0.0018819, 1.0/545868.0, -1.0/11306500.0]) % 360
+        cap_M       = _poly(c, [357.5291092, 35999.0502909, -0.0001536, 1.0/24490000.0]) % 360
+        cap_M_prime = _poly(c, [134.9633964, 477198.8675055, 0.0087414, 1.0/69699.0, -1.0/14712000.0]) % 360
+        cap_F       = _poly(c, [93.2720950, 483202.0175233, -0.0036539, -1.0/3526000.0, 1.0/863310000.0]) % 360
+        cap_E = _poly(c, [1, -0.002516, -0.0000074])
+
+        correction = sum(
+            v * cap_E ** abs(x) * _sin_deg(w * cap_D + x * cap_M + y * cap_M_prime + z * cap_F)
+            for v, w, x, y, z in zip(cc.lunar_sine_coefficients,
+                                     cc.lunar_args_elongation,
+                                     cc.lunar_args_solar_anomaly,
+                                     cc.lunar_args_lunar_anomaly,
+                                     cc.lunar_args_moon_node)
+        ) / 1_000_000
+
+        venus      = _mpf(3958) / 1_000_000 * _sin_deg(_mpf(119.75) + _mpf(131.849) * c)
+        jupiter    = _mpf(318) / 1_000_000 * _sin_deg(_mpf(53.09) + _mpf(479264.29) * c)
+        flat_earth = _mpf(1962) / 1_000_000 * _sin_deg(cap_L_prime - cap_F)
+
+        lam = (cap_L_prime + correction + venus + jupiter + flat_earth +
+               _aberration(c) + _nutation(c)) % 360
+        return +lam
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# result_cache.py
+#
+# Cache for computed calendar and chart results, keyed by the normalized
+# arguments of the function that produced them and by ALGORITHM_VERSION.
+# Two backends:
+#
+#   memory  in-process LRU (default), one per worker
+#   sqlite  on-disk table shared by every worker on the host
+#
+# Configured from the environment on first use:
+#
+#   RESULT_CACHE_BACKEND   memory | sqlite | none
+#   RESULT_CACHE_PATH      SQLite file (default: instance/result_cache.sqlite3)
+#   RESULT_CACHE_SIZE      maximum number of entries (default: 10000)
+#   RESULT_CACHE_MAX_BYTES maximum size of the stored keys and values, in bytes
+#                          (default: 32 MiB; characters for the SQLite backend)
+#
+# The SQLite file is trusted like a database: whatever it holds is served
+# as API responses, so it must live in a directory only the app can write.
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from calculation.timing import timed
+from calculation.version import ALGORITHM_VERSION
+
+DEFAULT_SIZE = 10_000
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# The app's instance directory, next to the data databases
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+
+
+class LRUBackend:
+    """
+    In-process least-recently-used store of at most `max_entries` values
+    taking at most `max_bytes` of memory (keys and values).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SIZE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(key, value) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    @timed('cache')
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    @timed('cache')
+    def set(self, key, value):
+        with self._lock:
+            old = self._data.get(key)
+            if old is not None:
+                self.bytes -= self._size(key, old)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self.bytes += self._size(key, value)
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                evicted_key, evicted = self._data.popitem(last=False)
+                self.bytes -= self._size(evicted_key, evicted)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+
+class SQLiteBackend:
+    """
+    SQLite table of at most `max_entries` values and `max_bytes`
+    characters of keys and values, shared by every process that opens
+    `path`.  When full, the oldest entries are evicted.
+    """
+
+    # Trim the table once every this many writes
+    EVICT_EVERY = 1000
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_SIZE,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, stored INTEGER NOT NULL)")
+        self._connection().execute("CREATE INDEX IF NOT EXISTS results_stored ON results (stored)")
+
+    def _connection(self):
+        # One connection per thread and per process (workers fork after import)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @timed('cache')
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    @timed('cache')
+    def set(self, key, value):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, stored) VALUES "
+            "(?, ?, COALESCE((SELECT MAX(stored) FROM results), 0) + 1)",
+            (key, value))
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM results WHERE stored <= "
+            "(SELECT stored FROM results ORDER BY stored DESC LIMIT 1 OFFSET ?)",
+            (self.max_entries,))
+        # Newest first, drop everything from the entry that crosses max_bytes
+        conn.execute(
+            "DELETE FROM results WHERE stored <= "
+            "(SELECT MAX(stored) FROM (SELECT stored, SUM(length(key) + length(value))"
+            " OVER (ORDER BY stored DESC) AS total FROM results) WHERE total > ?)",
+            (self.max_bytes,))
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+
+class ResultCache:
+    """
+    Function-result cache with hit/miss counts per namespace.  Results are
+    stored as JSON text, so callers always get a fresh copy.  The backend
+    comes from `backend_factory` on first use (None disables caching).
+    Keys carry ALGORITHM_VERSION, so results from an older version are never
+    returned.
+    """
+
+    def __init__(self, backend_factory):
+        self._backend_factory = backend_factory
+        self._backend = None
+        self._resolved = False
+        self._lock = threading.Lock()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    @property
+    def backend(self):
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._backend = self._backend_factory()
+                    self._resolved = True
+        return self._backend
+
+    def key(self, namespace: str, args, kwargs) -> str:
+        normalized = json.dumps([args, kwargs], default=str, sort_keys=True,
+                                separators=(',', ':'))
+        return f"{ALGORITHM_VERSION}:{namespace}:{normalized}"
+
+    def cached(self, namespace: str, encode=None, decode=None):
+        """
+        Decorator caching a function's results under `namespace`.  Values
+        must be JSON-serializable after `encode`; `decode` rebuilds them.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if backend is None:
+                    return func(*args, **kwargs)
+                key = self.key(namespace, args, kwargs)
+                stored = backend.get(key)
+                if stored is not None:
+                    self.hits[namespace] += 1
+                    stored = json.loads(stored)
+                    return decode(stored) if decode else stored
+                self.misses[namespace] += 1
+                value = func(*args, **kwargs)
+                backend.set(key, json.dumps(encode(value) if encode else value,
+                                            ensure_ascii=False, separators=(',', ':')))
+                return value
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        """
+        Hit and miss counts per namespace (this process only).
+        """
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {ns: {"hits": self.hits[ns], "misses": self.misses[ns]} for ns in namespaces}
+
+
+def backend_from_env():
+    kind = os.getenv('RESULT_CACHE_BACKEND', 'memory').lower()
+    size = int(os.getenv('RESULT_CACHE_SIZE', DEFAULT_SIZE))
+    max_bytes = int(os.getenv('RESULT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+    if kind == 'none':
+        return None
+    if kind == 'sqlite':
+        path = os.getenv('RESULT_CACHE_PATH', os.path.join(INSTANCE_DIR, 'result_cache.sqlite3'))
+        return SQLiteBackend(path, size, max_bytes)
+    if kind == 'memory':
+        return LRUBackend(size, max_bytes)
+    raise ValueError(f"unknown RESULT_CACHE_BACKEND {kind!r}")
+
+
+# Process-wide cache used by the web app
+result_cache = ResultCache(backend_from_env)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# solar_terms.py
+#
+# Exact moments of the jie (sectional solar terms) that open the months of a
+# BaZi chart.  The day of each term comes from chinese_solar_terms (the
+# precomputed table, or the calendar's own solver outside it); the moment is
+# then refined within that day and cached per year.
+
+from bisect import bisect_right
+from functools import lru_cache
+from math import floor
+
+from calculation.chinese_calendar import (
+    chinese_location, chinese_solar_terms, gregorian_year_from_fixed, midnight_in_china,
+    refine_solar_longitude, standard_from_universal, universal_from_standard,
+    winter_solar_longitude,
+)
+
+from calculation.timing import timed
+
+# In the order of chinese_solar_terms: term k is reached at 270 + 15k degrees
+SOLAR_TERM_NAMES = (
+    "Dongzhi", "Xiaohan", "Dahan", "Lichun", "Yushui", "Jingzhe",
+    "Chunfen", "Qingming", "Guyu", "Lixia", "Xiaoman", "Mangzhong",
+    "Xiazhi", "Xiaoshu", "Dashu", "Liqiu", "Chushu", "Bailu",
+    "Qiufen", "Hanlu", "Shuangjiang", "Lidong", "Xiaoxue", "Daxue",
+)
+
+# Month of month_boundaries opened by Lichun, which also starts the solar (BaZi) year
+LICHUN = 2
+
+
+def solar_term_longitude(k: int) -> float:
+    return (winter_solar_longitude + 15 * k) % 360
+
+
+def solar_term_moment(date: int, k: int) -> float:
+    """
+    Moment (UT) at which solar term `k` is reached during fixed `date`
+    (in China).
+    """
+    lo, hi = midnight_in_china(date), midnight_in_china(date + 1)
+    return refine_solar_longitude(solar_term_longitude(k), (lo + hi) / 2, lo, hi)
+
+
+@lru_cache(maxsize=256)
+def month_boundaries(g_year: int) -> tuple:
+    """
+    Jie moments bounding the months that overlap Gregorian year `g_year`:
+    the previous Daxue followed by the twelve jie of the year, Xiaohan
+    through Daxue.
+    """
+    daxue = 23
+    prior = solar_term_moment(chinese_solar_terms(g_year - 2)[daxue], daxue)
+    terms = chinese_solar_terms(g_year - 1)
+    return (prior,) + tuple(solar_term_moment(terms[k], k) for k in range(1, 24, 2))
+
+
+@timed('solar_terms')
+def solar_month_at(tee: float):
+    """
+    (solar_year, month) in effect at moment `tee` (UT).  Month 0 is the
+    Zi month opened by Daxue, 1 is Chou (Xiaohan), 2 is Yin (Lichun) and so
+    on; the solar year changes at Lichun.
+    """
+    local = standard_from_universal(tee, chinese_location(tee))
+    g_year = gregorian_year_from_fixed(floor(local))
+    i = bisect_right(month_boundaries(g_year), tee) - 1
+    solar_year = g_year if i >= LICHUN else g_year - 1
+    return solar_year, i % 12
+
+
+def moment_from_local(date: int, hour: int = 12, minute: int = 0) -> float:
+    """
+    Moment (UT) of China standard time `hour`:`minute` on fixed `date`.
+    """
+    local = date + (hour + minute / 60.0) / 24.0
+    return universal_from_standard(local, chinese_location(local))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# timing.py
+#
+# Per-request stage timings (Server-Timing).  Functions are tagged with a
+# stage name by @timed; while a TimingRecorder is active in the current
+# context, the time spent in each stage is accumulated, excluding nested
+# stages so the durations add up to the request time.
+#
+# Enabled with SERVER_TIMING=1 in the environment.  When disabled, @timed
+# returns the function unchanged, so instrumentation costs nothing.
+
+import os
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+enabled = os.getenv('SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+
+_recorder = ContextVar('timing_recorder', default=None)
+
+
+class TimingRecorder:
+    """
+    Exclusive time (ns) and call count per stage for one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter_ns()
+        self.durations = {}
+        self.counts = {}
+        # [stage, start, time spent in nested stages] per open stage
+        self._stack = []
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter_ns(), 0])
+
+    def exit(self):
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter_ns() - start
+        self._record(name, elapsed - nested)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def add(self, name, elapsed):
+        """
+        Record `elapsed` ns measured outside a stage (e.g. a DB query).
+        """
+        self._record(name, elapsed)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def _record(self, name, ns):
+        self.durations[name] = self.durations.get(name, 0) + ns
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def summary(self) -> dict:
+        """
+        Milliseconds per stage, plus "app" (time outside every stage) and
+        "total" since the recorder started.
+        """
+        total = time.perf_counter_ns() - self.started
+        stages = {name: ns / 1e6 for name, ns in self.durations.items()}
+        stages["app"] = max(0, total - sum(self.durations.values())) / 1e6
+        stages["total"] = total / 1e6
+        return stages
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms:.3f}" for name, ms in self.summary().items())
+
+
+def start_recording() -> TimingRecorder:
+    recorder = TimingRecorder()
+    _recorder.set(recorder)
+    return recorder
+
+
+def stop_recording():
+    _recorder.set(None)
+
+
+def current_recorder():
+    return _recorder.get()
+
+
+def timed(name):
+    """
+    Decorator attributing a function's time to stage `name`.
+    """
+    def decorator(func):
+        if not enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            recorder.enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.exit()
+        return wrapper
+    return decorator
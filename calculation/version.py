@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# version.py
+#
+# Version of the calendar and chart algorithms.  Bump it whenever a change in
+# calculation/ can change any computed result.  It keys the result cache and
+# the HTTP ETags of the calendar endpoints: clients revalidate within an hour
+# (apps/home/decorators.py) and then get the new results, while the nginx
+# cache must be purged by hand (see nginx/appseed-app.conf).
+# The precomputed calendar table records the version it was built with and
+# is ignored once they differ: rebuild it with
+# `python -m calculation.build_calendar_table` after every bump.
+#
+# Bump it as well after re-seeding the reference tables in the data database
+# (stems, branches, hidden stems; see apps/data/registry.py).  BaZi charts
+# include those records, but the ETags and the result cache are keyed on
+# this version only, so edited data is otherwise never served.
+
+ALGORITHM_VERSION = "2"
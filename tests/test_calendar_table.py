@@ -0,0 +1,35 @@
+"""
+The precomputed calendar table must match the astronomy it was built from.
+"""
+import pytest
+
+from calculation.chinese_calendar import (
+    CALENDAR_TABLE_HEADER, CALENDAR_TABLE_PATH, calendar_table, computed_chinese_year,
+    computed_solar_terms, load_calendar_table,
+)
+
+SAMPLE_YEARS = range(1899, 2101, 7)
+
+
+def test_table_is_loaded():
+    table = calendar_table()
+    assert min(table) == 1899 and max(table) == 2100
+
+
+@pytest.mark.parametrize('g_year', SAMPLE_YEARS)
+def test_table_matches_computed(g_year):
+    info, terms = calendar_table()[g_year]
+    computed = computed_chinese_year(g_year)
+    assert info == computed
+    assert terms == computed_solar_terms(computed.s1)
+
+
+def test_other_algorithm_version_is_ignored(tmp_path):
+    with open(CALENDAR_TABLE_PATH, 'rb') as f:
+        data = f.read()
+    magic, version, _, first_year, count = CALENDAR_TABLE_HEADER.unpack_from(data)
+    stale = tmp_path / 'stale.bin'
+    stale.write_bytes(CALENDAR_TABLE_HEADER.pack(magic, version, b'0', first_year, count)
+                      + data[CALENDAR_TABLE_HEADER.size:])
+    assert load_calendar_table(str(stale)) == {}
+    assert load_calendar_table(CALENDAR_TABLE_PATH) != {}
@@ -0,0 +1,65 @@
+"""
+Regression tests for the lunation-index new moon searches
+(`lunation_index_at_or_after`, `lunation_index_before`) over 1900-2100.
+"""
+import math
+
+import pytest
+
+from calculation.chinese_calendar import (
+    fixed_from_gregorian, lunation_index_at_or_after, lunation_index_before,
+    mean_synodic_month, midnight_in_china, new_moon_epoch, nth_new_moon,
+)
+
+FIRST_DAY = fixed_from_gregorian(1900, 1, 1)
+LAST_DAY = fixed_from_gregorian(2100, 12, 31)
+
+
+def linear_index_at_or_after(tee):
+    """
+    Reference: step up one lunation at a time from well before `tee`.
+    """
+    k = math.floor((tee - new_moon_epoch) / mean_synodic_month) - 3
+    assert nth_new_moon(k) < tee
+    while nth_new_moon(k) < tee:
+        k += 1
+    return k
+
+
+def moments():
+    """
+    Midnight UT and midnight in China of every day from 1900 to 2100.
+    """
+    for date in range(FIRST_DAY, LAST_DAY + 1):
+        yield date
+        yield midnight_in_china(date)
+
+
+def test_at_or_after_brackets_and_matches_linear_search():
+    for tee in moments():
+        k = lunation_index_at_or_after(tee)
+        assert nth_new_moon(k - 1) < tee <= nth_new_moon(k), tee
+        assert k == linear_index_at_or_after(tee), tee
+
+
+def test_before_brackets_and_matches_linear_search():
+    for tee in moments():
+        k = lunation_index_before(tee)
+        assert nth_new_moon(k) < tee <= nth_new_moon(k + 1), tee
+        assert k == linear_index_at_or_after(tee) - 1, tee
+
+
+def test_exact_new_moons():
+    for n in range(linear_index_at_or_after(FIRST_DAY), linear_index_at_or_after(LAST_DAY)):
+        tee = nth_new_moon(n)
+        assert lunation_index_at_or_after(tee) == n
+        assert lunation_index_before(tee) == n - 1
+
+
+@pytest.mark.parametrize('year', [57000, -60000])
+def test_out_of_range_gives_up(year):
+    tee = fixed_from_gregorian(year, 1, 1)
+    with pytest.raises(ValueError):
+        lunation_index_at_or_after(tee)
+    with pytest.raises(ValueError):
+        lunation_index_before(tee)